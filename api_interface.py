@@ -23,106 +23,196 @@ It:
 - Selects a model from the configured LLM_PROVIDER_LIST if none is provided.
 - Logs request and response details with advanced metrics if enabled.
 - Returns the extracted response content.
+- Serves repeated temperature-0 requests from the persistent response cache when enabled;
+  a response is only stored (or served) once the caller's cache_if check accepts it.
+- Provides acall_api, an asyncio counterpart of call_api for concurrent callers.
 """
 
 import time
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import asyncio
+import threading
+from typing import Callable, Dict, Any, Optional, Tuple
 from logging_manager import log_process, log_api_call  # log_api_call is assumed similar to log_json
 from config_manager import CONFIG
 from litellm_file_handler import call_litellm
+from response_cache import get_response_cache, make_cache_key
+from helpers import sequential_id
 import random
 
 class APIInterfaceError(Exception):
     """Custom exception for API interface errors."""
     pass
 
+# Bounds concurrent in-flight provider requests so batch callers stay under the RPM limit.
+_INFLIGHT_LIMIT = threading.BoundedSemaphore(max(1, CONFIG["LLM_RPM_LIMIT"] // 60))
+
 def exponential_backoff(attempt: int) -> float:
     """
     Calculates the delay for exponential backoff.
+    The capped delay is randomly shortened by up to API_JITTER of itself, so concurrent
+    callers that failed together do not all retry at the same instant.
     """
     initial_delay = CONFIG["API_INITIAL_DELAY"]
     max_delay = CONFIG["API_MAX_DELAY"]
     multiplier = CONFIG["API_BACKOFF_MULTIPLIER"]
-    delay = initial_delay * (multiplier ** (attempt - 1))
-    return min(delay, max_delay)
+    delay = min(initial_delay * (multiplier ** (attempt - 1)), max_delay)
+    return delay - random.uniform(0, delay * CONFIG["API_JITTER"])
+
+def is_recoverable_error(error: Exception) -> bool:
+    """
+    Returns True if a failed call is worth retrying.
+    Errors without an HTTP status (timeouts, connection resets, empty responses) and
+    408/429/5xx responses are transient; any other 4xx (auth, bad request) is permanent.
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        return True
+    return status_code in (408, 429) or status_code >= 500
 
 def generate_call_id() -> str:
     """
-    Generates a unique call ID based on the current timestamp.
+    Generates a unique call ID (helpers.sequential_id, as litellm_file_handler uses).
+    """
+    return sequential_id()
+
+def _select_model(model: Optional[str]) -> str:
+    """
+    Returns the given model, or one picked randomly from LLM_PROVIDER_LIST.
+    """
+    if model:
+        return model
+    return random.choice(CONFIG["LLM_PROVIDER_LIST_PARSED"])
+
+def _invoke_provider(prompt: str, system_message: Optional[str], model: str, json_mode: bool, max_tokens: Optional[int], temperature: Optional[float]) -> Tuple[str, float]:
+    """
+    Makes one provider request under the in-flight limit.
+    Returns the extracted response content and the request latency in seconds.
     """
-    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    with _INFLIGHT_LIMIT:
+        start_time = time.time()
+        response = call_litellm(prompt=prompt, system_message=system_message, model=model, json_mode=json_mode, max_tokens=max_tokens, temperature=temperature)
+        latency = time.time() - start_time
+    if not response:
+        raise APIInterfaceError("Empty API response")
+    # Extract content from the response.
+    if hasattr(response, 'choices'):
+        return response.choices[0].message.content, latency
+    return str(response), latency
 
-def call_api(prompt: str, system_message: Optional[str] = None, model: Optional[str] = None) -> Any:
+def _cache_accepts(cache_if: Callable[[str], bool], content: str) -> bool:
+    """
+    Returns True if the caller's check accepts content for caching (a raising check rejects it).
+    """
+    try:
+        return bool(cache_if(content))
+    except Exception:
+        return False
+
+def _build_request_data(prompt: str, system_message: Optional[str], model: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the structured request payload for log_api_call, or None when advanced
+    logging is off (so nothing is assembled for calls that will never be logged).
+    """
+    if CONFIG["LOG_VERBOSE_LEVEL"] not in ("advanced", "full"):
+        return None
+    return {
+        "prompt": prompt,
+        "system_message": system_message or "",
+        "model": model
+    }
+
+def _log_success(call_id: str, request_data: Optional[Dict[str, Any]], raw_response: str, latency: float, attempt: int) -> None:
+    """
+    Logs a successful call (and its metrics when advanced logging is enabled).
+    """
+    log_process(f"API call successful (ID: {call_id}) in {latency:.2f}s", "DEBUG", module="APIInterface")
+    if request_data is not None:
+        log_api_call(
+            endpoint="response",
+            request_data=request_data,
+            response_data={"content": raw_response, "latency": f"{latency:.2f}s", "attempt": attempt},
+            success=True,
+            error=None,
+            call_id=call_id
+        )
+
+def _fail(call_id: str, request_data: Optional[Dict[str, Any]], attempts: int, error: Exception) -> APIInterfaceError:
+    """
+    Logs the final failure of a call and returns the APIInterfaceError to raise.
+    The structured error payload is only logged when advanced logging is enabled.
+    """
+    error_msg = f"API call failed after {attempts} attempts. Last error: {error}"
+    log_process(error_msg, "ERROR", module="APIInterface")
+    if request_data is not None:
+        log_api_call(
+            endpoint="error",
+            request_data=request_data,
+            response_data={},
+            success=False,
+            error=str(error),
+            call_id=call_id
+        )
+    return APIInterfaceError(error_msg)
+
+def call_api(prompt: str, system_message: Optional[str] = None, model: Optional[str] = None, json_mode: bool = False, max_tokens: Optional[int] = None, temperature: Optional[float] = None, cache_if: Optional[Callable[[str], bool]] = None) -> Any:
     """
     Makes an API call using the LLM provider with exponential backoff retries.
     
     Process:
     - Selects a model randomly from LLM_PROVIDER_LIST if model is not provided.
     - Logs the initial request.
-    - Calls call_litellm to get the response.
+    - Calls call_litellm to get the response (requesting a JSON object response if json_mode is set,
+      capping the completion at max_tokens, and sampling at temperature, if given).
     - Logs detailed response metrics (if advanced logging is enabled).
     - Returns the raw response content.
+    
+    Response cache: only temperature-0 calls that pass a cache_if check are cached. The key holds
+    the actual model and temperature; a completion is stored, and a cached one served, only if
+    cache_if(content) returns True, so a response the caller would reject is never replayed.
     """
     call_id = generate_call_id()
     max_attempts = CONFIG["API_MAX_ATTEMPTS"]
     attempt = 1
-    last_error = None
-    
-    if not model:
-        providers = CONFIG["LLM_PROVIDER_LIST"].split(",")
-        model = random.choice(providers).strip()
+    model = _select_model(model)
     
     log_process(f"Initiating API call (ID: {call_id}) using model {model}", "INFO", module="APIInterface")
-    request_data = {
-        "prompt": prompt,
-        "system_message": system_message or "",
-        "model": model
-    }
+    request_data = _build_request_data(prompt, system_message, model)
+    cache = get_response_cache() if temperature == 0 and cache_if is not None else None
+    cache_key = make_cache_key(model, system_message, prompt, json_mode, temperature) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None and _cache_accepts(cache_if, cached):
+            log_process(f"API call served from response cache (ID: {call_id})", "DEBUG", module="APIInterface")
+            return cached
     
     while attempt <= max_attempts:
         try:
             log_process(f"API call attempt {attempt} (ID: {call_id})", "DEBUG", module="APIInterface")
-            start_time = time.time()
-            response = call_litellm(prompt=prompt, system_message=system_message, model=model)
-            latency = time.time() - start_time
-            if not response:
-                raise APIInterfaceError("Empty API response")
-            # Extract content from the response.
-            if hasattr(response, 'choices'):
-                raw_response = response.choices[0].message.content
-            else:
-                raw_response = str(response)
-            log_process(f"API call successful (ID: {call_id}) in {latency:.2f}s", "DEBUG", module="APIInterface")
-            if CONFIG["LOG_VERBOSE_LEVEL"] in ("advanced", "full"):
-                log_api_call(
-                    endpoint="response",
-                    request_data=request_data,
-                    response_data={"content": raw_response, "latency": f"{latency:.2f}s", "attempt": attempt},
-                    success=True,
-                    error=None,
-                    call_id=call_id
-                )
+            raw_response, latency = _invoke_provider(prompt, system_message, model, json_mode, max_tokens, temperature)
+            _log_success(call_id, request_data, raw_response, latency, attempt)
+            if cache is not None and _cache_accepts(cache_if, raw_response):
+                cache.set(cache_key, raw_response)
             return raw_response
         except Exception as e:
-            last_error = e
-            if attempt < max_attempts:
+            recoverable = is_recoverable_error(e)
+            if recoverable and attempt < max_attempts:
                 delay = exponential_backoff(attempt)
-                log_process(f"API call attempt {attempt} failed: {e}. Retrying in {delay:.1f}s...", "WARNING", module="APIInterface")
+                log_process(f"API call attempt {attempt} failed: {e}. Retrying in {delay:.1f}s... (retried=true)", "WARNING", module="APIInterface")
                 time.sleep(delay)
                 attempt += 1
             else:
-                error_msg = f"API call failed after {max_attempts} attempts. Last error: {e}"
-                log_process(error_msg, "ERROR", module="APIInterface")
-                log_api_call(
-                    endpoint="error",
-                    request_data=request_data,
-                    response_data={},
-                    success=False,
-                    error=str(e),
-                    call_id=call_id
-                )
-                raise APIInterfaceError(error_msg) from last_error
+                if not recoverable:
+                    log_process(f"API call attempt {attempt} failed with a permanent error; not retrying (retried=false)", "WARNING", module="APIInterface")
+                raise _fail(call_id, request_data, attempt, e) from e
+
+async def acall_api(prompt: str, system_message: Optional[str] = None, model: Optional[str] = None, json_mode: bool = False, max_tokens: Optional[int] = None, temperature: Optional[float] = None, cache_if: Optional[Callable[[str], bool]] = None) -> Any:
+    """
+    Async counterpart of call_api with the same retry, logging, caching, and return behaviour.
+
+    call_api (including its backoff sleeps) runs on a worker thread via asyncio.to_thread,
+    so concurrent callers overlap their network waits without blocking the event loop.
+    """
+    return await asyncio.to_thread(call_api, prompt, system_message, model, json_mode, max_tokens, temperature, cache_if)
 
 # End of api_interface.py
@@ -52,13 +52,18 @@ def get_openai_api_key() -> str:
 # Global configuration dictionary used across modules.
 CONFIG = {
     # API Keys and Providers
-    "API_KEY_OPENAI": get_openai_api_key(),
+    # Read lazily-validated: only the OpenAI provider path calls get_openai_api_key(), which raises if unset.
+    "API_KEY_OPENAI": os.getenv("API_KEY_OPENAI", ""),
     "LLM_PROVIDER": os.getenv("LLM_PROVIDER", "openai"),
     # Comma-separated list of providers for multi-LLM selection
     "LLM_PROVIDER_LIST": os.getenv("LLM_PROVIDER_LIST", "gpt-4,claude-2,llama-2"),
+    # Cheaper/faster models for trivial tasks such as section length reductions (empty = use LLM_PROVIDER_LIST)
+    "LLM_PROVIDER_LIST_FAST": os.getenv("LLM_PROVIDER_LIST_FAST", ""),
     
     # Logging configuration
     "LOG_VERBOSE_LEVEL": os.getenv("LOG_VERBOSE_LEVEL", "basic"),  # Options: basic, advanced, full
+    # Minimum level written by log_process (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    "LOG_LEVEL": os.getenv("LOG_LEVEL", "INFO").upper(),
     "ENABLE_CSV_EXPORT": os.getenv("ENABLE_CSV_EXPORT", "false").lower() == "true",
     
     # Concurrency and timeout settings
@@ -70,14 +75,47 @@ CONFIG = {
     "API_INITIAL_DELAY": int(os.getenv("API_INITIAL_DELAY", "2")),
     "API_MAX_DELAY": int(os.getenv("API_MAX_DELAY", "60")),
     "API_BACKOFF_MULTIPLIER": float(os.getenv("API_BACKOFF_MULTIPLIER", "2.0")),
+    # Fraction of each backoff delay that is randomized (0 = deterministic, 1 = full jitter).
+    "API_JITTER": float(os.getenv("API_JITTER", "0.5")),
     "API_TIMEOUT": int(os.getenv("API_TIMEOUT", "30")),
+    # Provider requests-per-minute budget; bounds the number of in-flight API calls.
+    "LLM_RPM_LIMIT": int(os.getenv("LLM_RPM_LIMIT", "500")),
+    # Keep-alive connections pooled per provider host by the shared HTTP session.
+    "HTTP_POOL_MAXSIZE": int(os.getenv("HTTP_POOL_MAXSIZE", "32")),
+    # Ask providers for latency-optimized serving (OpenRouter latency routing, OpenAI priority tier).
+    "API_LATENCY_OPTIMIZED": os.getenv("API_LATENCY_OPTIMIZED", "false").lower() == "true",
     "DEFAULT_MODEL": os.getenv("DEFAULT_MODEL", "gpt-4"),
     
+    # Persistent LLM response cache (see response_cache.py), opt-in; TTL in seconds.
+    "RESPONSE_CACHE_ENABLED": os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true",
+    "RESPONSE_CACHE_TTL": int(os.getenv("RESPONSE_CACHE_TTL", "86400")),
+    "RESPONSE_CACHE_PATH": os.getenv("RESPONSE_CACHE_PATH", "CACHE/response_cache.sqlite3"),
+    # Persistent cache of text extracted from job and resume files (see helpers.cached_file_text), opt-in.
+    # Entries are plain-text copies of the documents (personal data) and are never evicted; clear TEXT_CACHE_DIR by hand.
+    "TEXT_CACHE_ENABLED": os.getenv("TEXT_CACHE_ENABLED", "false").lower() == "true",
+    "TEXT_CACHE_DIR": os.getenv("TEXT_CACHE_DIR", "CACHE/text_cache"),
+    
     # Enable fallback to salvage partially valid JSON responses from LLM calls.
     "ALLOW_PARTIAL_JSON_PARSE": os.getenv("ALLOW_PARTIAL_JSON_PARSE", "false").lower() == "true",
+    # Keep the job's raw text alongside the extracted JSON, as a gzip sidecar (false = drop it; the source file is kept in DONE)
+    "STORE_RAW_TEXT": os.getenv("STORE_RAW_TEXT", "false").lower() == "true",
+    # Maximum characters of job text sent to the LLM for extraction (the full text is still kept)
+    "MAX_EXTRACTION_CHARS": int(os.getenv("MAX_EXTRACTION_CHARS", "32000")),
+    
+    # Resume selection for match optimization: "heuristic" (usage/length, the default) or "similarity" (per job, see resume_similarity.py; opt-in)
+    "RESUME_SELECTION": os.getenv("RESUME_SELECTION", "heuristic").lower(),
+    # Minimum job/resume cosine similarity for a resume to be selected in "similarity" mode
+    "RESUME_MIN_SIMILARITY": float(os.getenv("RESUME_MIN_SIMILARITY", "0.0")),
+    
+    # Sampling temperature of the match optimizer's LLM calls; 0 makes them deterministic and lets
+    # validated results be reused from the response cache (sampled results are never cached).
+    "OPTIMIZER_TEMPERATURE": float(os.getenv("OPTIMIZER_TEMPERATURE", "0.7")),
     
     # Database and other keys (if needed)
     "DATABASE_URL": os.getenv("DATABASE_URL", "sqlite:///./my_pipeline.db"),
 }
 
+# LLM_PROVIDER_LIST parsed once at load, so per-call model selection is a plain random.choice.
+CONFIG["LLM_PROVIDER_LIST_PARSED"] = tuple(p.strip() for p in CONFIG["LLM_PROVIDER_LIST"].split(",") if p.strip())
+
 # End of config_manager.py
@@ -7,15 +7,18 @@
 Provide utility functions:
 
     normalize_text, estimate_tokens.
-    safe_file_write with backup.
+    safe_file_write (atomic, optional backup).
     validate_file_path.
-    create_unique_id.
+    docx_text (streamed DOCX body text).
+    cached_file_text (memory + disk cache of extracted file text).
+    create_unique_id, sequential_id.
     merge_json_data.
     clean_filename.
     format_size.
 
 Add a new helper, export_to_csv, for CSV logging.
-Add a new helper, partial_json_salvage, to salvage partial JSON using regex.
+Add a new helper, partial_json_salvage, to salvage partial JSON (bracket repair, then regex).
+Add loads_or_salvage: strict JSON parse first, then the first JSON span (json5 if installed), salvage last.
 '''
 
 """
@@ -23,29 +26,77 @@ Helpers Module
 
 This module provides utility functions common across the system:
 - Text normalization and token estimation.
-- Safe file writing with backup.
+- Safe (atomic) file writing with optional backup.
 - File path validation.
+- Streamed DOCX body text extraction.
+- Cached file text extraction (shared by the job and resume extractors).
 - Unique ID creation.
 - Merging JSON data.
 - Filename cleaning and size formatting.
 - Export to CSV utility.
-- Partial JSON salvage (for when LLM responses are incomplete).
+- Partial JSON salvage (for when LLM responses are incomplete), and the shared LLM JSON parser
+  (strict parse first, then the first JSON span, json5 if installed, salvage last).
 """
 
 import os
 import re
+import csv
 import json
+import atexit
 import shutil
+import secrets
 import hashlib
+import itertools
+import threading
+import zipfile
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union, Set
+from typing import Callable, Deque, Dict, List, Optional, Any, Tuple, Union, Set
 from datetime import datetime
+from functools import lru_cache
+
+from lxml import etree  # installed with python-docx
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser.
+    orjson = None
+try:
+    import json5
+except ImportError:  # json5 is optional; only used as a lenient fallback parser.
+    json5 = None
+
 from config_manager import CONFIG
 from logging_manager import log_process
 
 FilePath = Union[str, Path]
 JSONType = Dict[str, Any]
 
+# Patterns compiled once at import (normalize_text, clean_filename, partial_json_salvage).
+_RE_MULTI_NL = re.compile(r"\n{3,}")
+_RE_BAD_FNAME = re.compile(r'[<>:"/\\|?*]')
+_RE_JSON_PAIR = re.compile(r'"([^"]+)"\s*:\s*"([^"]+)"')
+
+# WordprocessingML element tags read by docx_text.
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_W_NS}p"
+_W_T = f"{_W_NS}t"
+_W_R = f"{_W_NS}r"
+_W_TAB = f"{_W_NS}tab"
+_W_BR = f"{_W_NS}br"
+_W_CR = f"{_W_NS}cr"
+_W_TYPE = f"{_W_NS}type"
+_W_BODY = f"{_W_NS}body"
+
+# Bytes of file content hashed (with size and mtime) to key the persistent text cache.
+_TEXT_CACHE_HEAD_BYTES = 64 * 1024
+# Mixed into text cache keys; bump when extraction output changes so stale entries are not served.
+_TEXT_CACHE_VERSION = 2
+
+# Run-scoped prefix and counter behind sequential_id.
+_RUN_PREFIX = f"{datetime.now():%Y%m%d_%H%M%S}"
+_ID_COUNTER = itertools.count()
+
 class HelperError(Exception):
     """Custom exception for helper-related errors."""
     pass
@@ -56,21 +107,24 @@ def normalize_text(text: str) -> str:
     """
     text = " ".join(text.split())
     text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_MULTI_NL.sub("\n\n", text)
     return text.strip()
 
 def estimate_tokens(text: str) -> int:
     """
     Estimates token count based on an average of 1.3 tokens per word.
+    Words are approximated from the length (~6 characters per word including its separator),
+    so the estimate is O(1) and allocates nothing.
     """
-    words = len(text.split())
-    return int(words * 1.3)
+    return (len(text) * 13) // 60
 
-def safe_file_write(path: FilePath, content: Union[str, bytes, Dict], make_dirs: bool = True, backup: bool = True) -> None:
+def safe_file_write(path: FilePath, content: Union[str, bytes, Dict], make_dirs: bool = True, backup: bool = False) -> None:
     """
     Safely writes content to a file.
     Creates parent directories if needed.
-    If backup is enabled and the file exists, creates a .bak copy.
+    The content is written to a sibling .tmp file and moved into place with os.replace,
+    so readers never see a partially written file; the .tmp file is removed if the write fails.
+    If backup is enabled and the file exists, creates a .bak copy first.
     """
     try:
         path = Path(path)
@@ -81,11 +135,21 @@ def safe_file_write(path: FilePath, content: Union[str, bytes, Dict], make_dirs:
             shutil.copy2(path, backup_path)
         mode = "wb" if isinstance(content, bytes) else "w"
         encoding = None if isinstance(content, bytes) else "utf-8"
-        with open(path, mode, encoding=encoding) as f:
-            if isinstance(content, (str, bytes)):
-                f.write(content)
-            else:
-                json.dump(content, f, indent=2)
+        tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+        try:
+            with open(tmp_path, mode, encoding=encoding) as f:
+                if isinstance(content, (str, bytes)):
+                    f.write(content)
+                else:
+                    json.dump(content, f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Do not leave a half-written .tmp file behind.
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
     except Exception as e:
         raise HelperError(f"Failed to write file {path}: {e}")
 
@@ -104,30 +168,111 @@ def validate_file_path(path: FilePath, must_exist: bool = True, allowed_suffixes
     except Exception as e:
         raise HelperError(f"Invalid file path: {e}")
 
+def docx_text(path: FilePath, skip_empty: bool = False) -> str:
+    """
+    Returns the text of a DOCX file's body paragraphs, one per line.
+    Streams word/document.xml with lxml iterparse (no python-docx object graph) and clears
+    each paragraph once read. Tabs and line breaks become "\t" and "\n", as in python-docx's
+    paragraph.text. Raises on a missing or malformed document part; callers fall back to python-docx.
+    """
+    lines: List[str] = []
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document_xml:
+        for _, paragraph in etree.iterparse(document_xml, events=("end",), tag=_W_P):
+            # Only direct body paragraphs; those nested in tables are skipped as before.
+            if paragraph.getparent().tag == _W_BODY:
+                text = _paragraph_text(paragraph)
+                if text or not skip_empty:
+                    lines.append(text)
+                paragraph.clear()
+    return "\n".join(lines)
+
+def _paragraph_text(paragraph: Any) -> str:
+    """
+    Returns a w:p element's text: w:t text, "\t" per run-level w:tab, "\n" per w:cr and text-wrapping w:br.
+    """
+    parts: List[str] = []
+    for node in paragraph.iter(_W_T, _W_TAB, _W_BR, _W_CR):
+        if node.tag == _W_T:
+            parts.append(node.text or "")
+        elif node.getparent().tag != _W_R:
+            continue  # w:tab inside w:pPr/w:tabs defines a tab stop; it is not text.
+        elif node.tag == _W_TAB:
+            parts.append("\t")
+        elif node.tag == _W_CR or node.get(_W_TYPE, "textWrapping") == "textWrapping":
+            parts.append("\n")  # Page and column breaks carry no text, as in python-docx.
+    return "".join(parts)
+
+def cached_file_text(path: FilePath, reader: Callable[[Path], Optional[str]], namespace: str) -> Optional[str]:
+    """
+    Returns reader(path), cached per (path, mtime, size) in memory and, if TEXT_CACHE_ENABLED,
+    on disk under TEXT_CACHE_DIR, so re-runs do not re-parse unchanged files.
+    The disk key hashes namespace, size, mtime, and the first 64 KB of the file, so a hit costs
+    a stat and one short read; namespace keeps different readers of the same file apart.
+    Raises OSError if the file cannot be stat'ed; reader errors propagate.
+    """
+    path = Path(path)
+    st = path.stat()
+    return _cached_file_text(str(path), st.st_mtime_ns, st.st_size, reader, namespace)
+
+@lru_cache(maxsize=512)
+def _cached_file_text(path: str, mtime_ns: int, size: int, reader: Callable[[Path], Optional[str]], namespace: str) -> Optional[str]:
+    """
+    Returns the text of path, from the on-disk text cache when possible (see cached_file_text).
+    """
+    cache_file = None
+    if CONFIG["TEXT_CACHE_ENABLED"]:
+        try:
+            digest = hashlib.sha256(f"v{_TEXT_CACHE_VERSION}:{namespace}:{size}:{mtime_ns}:".encode("utf-8"))
+            with open(path, "rb") as f:
+                digest.update(f.read(_TEXT_CACHE_HEAD_BYTES))
+            cache_file = Path(CONFIG["TEXT_CACHE_DIR"]) / f"{digest.hexdigest()}.txt"
+            if cache_file.exists():
+                return cache_file.read_text(encoding="utf-8")
+        except OSError as e:
+            log_process(f"Text cache lookup failed for {path}: {e}", "WARNING", module="Helpers")
+            cache_file = None
+    text = reader(Path(path))
+    if text and cache_file is not None:
+        try:
+            safe_file_write(cache_file, text)
+        except HelperError as e:
+            log_process(f"Text cache write failed for {path}: {e}", "WARNING", module="Helpers")
+    return text
+
 def create_unique_id(prefix: str = "") -> str:
     """
-    Creates a unique ID using the current timestamp and a random hash.
+    Creates a unique ID using the current timestamp and a random 8-hex-digit suffix.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    random_hash = hashlib.md5(os.urandom(32)).hexdigest()[:8]
-    return f"{prefix}{timestamp}_{random_hash}"
+    return f"{prefix}{datetime.now():%Y%m%d_%H%M%S}_{secrets.token_hex(4)}"
+
+def sequential_id(prefix: str = "") -> str:
+    """
+    Returns a process-unique ID: the run's start timestamp plus an increasing counter.
+    Cheaper than formatting the clock per call, and unique even for concurrent callers.
+    """
+    return f"{prefix}{_RUN_PREFIX}_{next(_ID_COUNTER):06d}"
 
 def merge_json_data(base: Dict[str, Any], update: Dict[str, Any], merge_lists: bool = False) -> Dict[str, Any]:
     """
     Deep merges two JSON dictionaries.
     If merge_lists is True, list values are extended.
+
+    Iterative (explicit stack, no recursion). Only the dicts along merged paths are
+    copied, and merged lists are new lists, so base is never mutated.
     """
     result = base.copy()
-    for key, value in update.items():
-        if key in result:
-            if isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = merge_json_data(result[key], value, merge_lists)
-            elif merge_lists and isinstance(result[key], list) and isinstance(value, list):
-                result[key].extend(value)
+    stack = [(result, update)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                target[key] = current.copy()
+                stack.append((target[key], value))
+            elif merge_lists and isinstance(current, list) and isinstance(value, list):
+                target[key] = current + value
             else:
-                result[key] = value
-        else:
-            result[key] = value
+                target[key] = value
     return result
 
 def clean_filename(filename: str) -> str:
@@ -135,7 +280,7 @@ def clean_filename(filename: str) -> str:
     Cleans a filename by removing invalid characters and replacing spaces with underscores.
     Truncates the filename if necessary.
     """
-    filename = re.sub(r'[<>:"/\\|?*]', "", filename)
+    filename = _RE_BAD_FNAME.sub("", filename)
     filename = filename.replace(" ", "_")
     max_length = 255 - len(".extension")
     if len(filename) > max_length:
@@ -152,35 +297,232 @@ def format_size(size_bytes: int) -> str:
         size_bytes /= 1024
     return f"{size_bytes:.1f} TB"
 
+class CsvBatchWriter:
+    """
+    Buffers CSV rows in memory and appends them to one file in batches.
+    Rows are flushed every flush_every appends, on flush(), and at interpreter exit.
+    The header is written from the first row's keys when the file is created.
+    """
+    def __init__(self, filename: FilePath, flush_every: int = 100):
+        self.path = Path(filename)
+        self.flush_every = flush_every
+        self._rows: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+
+    def append(self, data: Dict[str, Any]) -> None:
+        """
+        Queues a row, flushing the batch once flush_every rows are pending.
+        """
+        with self._lock:
+            self._rows.append(data)
+            if len(self._rows) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """
+        Writes all pending rows to the file.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._rows:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_exists = self.path.exists()
+        with self.path.open("a", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(self._rows[0].keys()), extrasaction="ignore")
+            if not file_exists:
+                writer.writeheader()
+            writer.writerows(self._rows)
+        self._rows.clear()
+
+# One batch writer per CSV file, shared by all export_to_csv callers.
+_CSV_WRITERS: Dict[str, CsvBatchWriter] = {}
+_CSV_WRITERS_LOCK = threading.Lock()
+
+def flush_csv_exports() -> None:
+    """
+    Flushes every pending export_to_csv row to disk.
+    """
+    with _CSV_WRITERS_LOCK:
+        writers = list(_CSV_WRITERS.values())
+    for writer in writers:
+        writer.flush()
+
+atexit.register(flush_csv_exports)
+
 def export_to_csv(data: Dict[str, Any], filename: str) -> None:
     """
     Exports a dictionary to a CSV file.
-    Useful for CSV logging.
-    """
-    file_path = Path(filename)
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = list(data.keys())
-    file_exists = file_path.exists()
-    with file_path.open("a", newline="", encoding="utf-8") as csvfile:
-        import csv
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(data)
+    Useful for CSV logging. Rows are buffered by a per-file CsvBatchWriter;
+    call flush_csv_exports() to force them to disk.
+    """
+    key = str(Path(filename))
+    with _CSV_WRITERS_LOCK:
+        writer = _CSV_WRITERS.get(key)
+        if writer is None:
+            writer = _CSV_WRITERS[key] = CsvBatchWriter(key)
+    writer.append(data)
+
+def _close_truncated_json(raw_text: str) -> List[str]:
+    """
+    Builds repair candidates for a truncated JSON object.
+
+    Walks the text from the first '{' tracking open brackets and string state, then returns:
+    - the text with any open string and brackets closed, and
+    - the text cut back to the last comma outside a string, with its brackets closed
+      (drops a half-written trailing member such as a key with no value).
+    """
+    start = raw_text.find("{")
+    if start == -1:
+        return []
+    text = raw_text[start:]
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    last_comma: Optional[tuple] = None
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return [text[:index + 1]]
+        elif char == ",":
+            last_comma = (index, tuple(stack))
+
+    candidates = []
+    tail = text + ('"' if in_string else "")
+    stripped = tail.rstrip()
+    if stripped.endswith(","):
+        stripped = stripped[:-1]
+    elif stripped.endswith(":"):
+        stripped += " null"
+    candidates.append(stripped + "".join(reversed(stack)))
+    if last_comma is not None:
+        index, comma_stack = last_comma
+        candidates.append(text[:index] + "".join(reversed(comma_stack)))
+    return candidates
 
 def partial_json_salvage(raw_text: str) -> Dict[str, Any]:
     """
-    Attempts to salvage partially valid JSON from a raw string using regex.
+    Attempts to salvage partially valid JSON from a raw string.
     
-    Searches for key-value pairs of the form "key": "value".
-    Raises an error if no pairs are found.
+    Returns the parsed object directly if raw_text is already a valid JSON object.
+    Otherwise closes any open strings/brackets of a truncated object and re-parses
+    (keeping numbers, arrays, and nested objects), and as a last resort searches
+    for key-value pairs of the form "key": "value" using regex.
+    Raises an error if nothing can be recovered.
     """
+    try:
+        parsed = json.loads(raw_text)
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+    for candidate in _close_truncated_json(raw_text):
+        try:
+            parsed = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict) and parsed:
+            return parsed
     salvaged = {}
-    pairs = re.findall(r'"([^"]+)"\s*:\s*"([^"]+)"', raw_text)
+    pairs = _RE_JSON_PAIR.findall(raw_text)
     for key, value in pairs:
         salvaged[key] = value
     if not salvaged:
         raise ValueError("Partial JSON salvage failed; no key-value pairs found.")
     return salvaged
 
+def find_json_span(text: str, start: int = 0, openers: str = "{[") -> Optional[Tuple[int, str]]:
+    """
+    Returns (position, span) for the first complete top-level JSON object or array in text
+    that begins at or after start with one of openers, or None.
+    Tracks bracket depth outside of string literals so trailing prose is ignored. Returns None
+    if the first candidate never closes (a truncated response): anything after it is a nested
+    fragment, which is left to partial_json_salvage.
+    """
+    starts = [i for i in (text.find(opener, start) for opener in openers) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return start, text[start:i + 1]
+    return None
+
+def _loads_span(span: str) -> Any:
+    """
+    Parses one candidate JSON span: strict first, then json5 if installed.
+    """
+    try:
+        return orjson.loads(span) if orjson is not None else json.loads(span)
+    except ValueError:
+        if json5 is None:
+            raise
+    return json5.loads(span)
+
+def loads_or_salvage(raw_text: Union[str, bytes], expect: Optional[type] = None) -> Tuple[Any, bool]:
+    """
+    Parses JSON from an LLM response, from strictest to most lenient:
+    - strict parse of the whole text (orjson when installed);
+    - each complete object/array in the text, in order, until one parses (tolerates surrounding
+      prose, including brackets in it); a span is parsed strictly, then with json5 if installed
+      (single quotes, trailing commas, comments);
+    - partial_json_salvage, if ALLOW_PARTIAL_JSON_PARSE is enabled.
+
+    With expect=dict (or list), only spans starting with '{' (or '[') that parse to that type are accepted.
+    Returns (parsed, partial) where partial is True if the result came from salvage.
+    If nothing parses and salvage is disabled, the strict parse error is re-raised.
+    """
+    try:
+        return (orjson.loads(raw_text) if orjson is not None else json.loads(raw_text)), False
+    except ValueError as e:
+        error = e
+    if isinstance(raw_text, bytes):
+        raw_text = raw_text.decode("utf-8", errors="replace")
+    openers = "{" if expect is dict else "[" if expect is list else "{["
+    found = find_json_span(raw_text, 0, openers)
+    while found is not None:
+        position, span = found
+        try:
+            parsed = _loads_span(span)
+        except ValueError:
+            parsed = None
+        if parsed is not None and (expect is None or isinstance(parsed, expect)):
+            return parsed, False
+        found = find_json_span(raw_text, position + 1, openers)
+    if not CONFIG.get("ALLOW_PARTIAL_JSON_PARSE", False):
+        raise error
+    return partial_json_salvage(raw_text), True
+
 # End of helpers.py
@@ -22,13 +22,15 @@ This module refines text content (e.g. an overview or bullet points) by:
 - Logging each iteration's metrics for advanced analysis.
 """
 
+import re
 import json
 import time
+import random
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from functools import lru_cache
 
-from logging_manager import log_process, log_advanced_metric
+from logging_manager import log_process, log_advanced_metric, log_debug_lazy
 from config_manager import CONFIG
 from helpers import estimate_tokens
 from api_interface import call_api
@@ -36,6 +38,18 @@ from api_interface import call_api
 # Type alias for JSON data.
 JSONType = Dict[str, Any]
 
+# Sections less than this far over max_chars are trimmed locally instead of via the LLM.
+LOCAL_TRIM_MAX_OVERAGE = 1.3
+
+# Fast-model pool for section reductions; empty means call_api picks from LLM_PROVIDER_LIST.
+_FAST_MODELS = tuple(m.strip() for m in CONFIG.get("LLM_PROVIDER_LIST_FAST", "").split(",") if m.strip())
+
+# Floor for the completion cap on reduction calls (very short inputs still need room to answer).
+_MIN_REDUCTION_TOKENS = 32
+
+# Sentence boundaries used by trim_to_limit.
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
 @dataclass
 class RefinementMetrics:
     """
@@ -75,23 +89,59 @@ def validate_section_limits(section_name: str) -> Dict[str, Union[int, float]]:
     except Exception as e:
         raise RefinementError(f"Failed to get limits for {section_name}: {e}")
 
+@lru_cache(maxsize=1)
+def _load_prompts() -> JSONType:
+    """
+    Loads STATIC_DATA/prompt_templates/all_prompts.json once and caches the parsed prompts.
+    """
+    with open("STATIC_DATA/prompt_templates/all_prompts.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def trim_to_limit(text: str, max_chars: int) -> str:
+    """
+    Deterministically shortens text to at most max_chars.
+    Keeps whole sentences while they fit; if even the first sentence is too long,
+    cuts it at the last word boundary within the limit.
+    """
+    text = text.strip()
+    if len(text) <= max_chars:
+        return text
+    kept: List[str] = []
+    length = 0
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        added = len(sentence) + (1 if kept else 0)
+        if length + added > max_chars:
+            break
+        kept.append(sentence)
+        length += added
+    if kept:
+        return " ".join(kept)
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    return (cut[:space] if space > 0 else cut).rstrip(" ,;:-")
+
 def refine_section_via_llm(section_text: str, reduction_percentage: int, section_name: str = "section") -> str:
     """
     Uses an LLM API call to reduce the given section by a specified reduction percentage.
     
-    Loads the appropriate prompt from STATIC_DATA/prompt_templates/all_prompts.json.
+    Uses the section_reduction_prompt from the cached all_prompts.json.
+    The completion is capped at 1.5x the input's estimated token count (plus 64).
     Returns the refined text.
     """
     try:
-        with open("STATIC_DATA/prompt_templates/all_prompts.json", "r", encoding="utf-8") as f:
-            prompts = json.load(f)
+        prompts = _load_prompts()
         prompt = prompts["section_reduction_prompt"]["prompt"].format(
             section_name=section_name,
             reduction_percentage=reduction_percentage,
             text=section_text
         )
         system_message = prompts["section_reduction_prompt"]["system_message"]
-        result = call_api(prompt=prompt, system_message=system_message)
+        # Length reductions are trivial rewrites; route them to the fast model pool when configured.
+        model = random.choice(_FAST_MODELS) if _FAST_MODELS else None
+        # A reduction is shorter than its input; cap decoding at the input's size plus headroom,
+        # since estimate_tokens is approximate and a truncated rewrite would be worse than none.
+        max_tokens = max(_MIN_REDUCTION_TOKENS, int(estimate_tokens(section_text) * 1.5) + 64)
+        result = call_api(prompt=prompt, system_message=system_message, model=model, max_tokens=max_tokens)
         if not result:
             raise RefinementError("Empty API response")
         return result.strip()
@@ -102,6 +152,8 @@ def refine_section(text: str, section_name: str = "section", max_iterations: int
     """
     Iteratively refines a section to meet defined limits.
     
+    If the text is only slightly over max_chars (< LOCAL_TRIM_MAX_OVERAGE), it is first trimmed locally
+    with trim_to_limit, with no API call.
     On each iteration, if the text exceeds max limits (characters, words, tokens), calls refine_section_via_llm.
     If maximum iterations are reached, uses a fallback summarization prompt.
     Logs iteration details if advanced logging is enabled.
@@ -110,6 +162,7 @@ def refine_section(text: str, section_name: str = "section", max_iterations: int
         limits = validate_section_limits(section_name)
         original_text = text
         iteration = 0
+        trimmed = False
         while iteration < max_iterations:
             char_count = len(text)
             word_count = len(text.split())
@@ -117,16 +170,22 @@ def refine_section(text: str, section_name: str = "section", max_iterations: int
             max_chars = limits["max_chars"] * (1 + limits["tolerance"])
             if char_count <= max_chars and word_count <= limits["max_words"] and token_count <= limits["max_tokens"]:
                 break
+            overage = char_count / limits["max_chars"]
+            if not trimmed and overage < LOCAL_TRIM_MAX_OVERAGE:
+                text = trim_to_limit(text, limits["max_chars"])
+                trimmed = True
+                log_process(f"{section_name}: {overage:.2f}x over limit, trimmed locally to {len(text)} chars", "DEBUG", module="IterativeRefiner")
+                continue
+            log_process(f"{section_name}: {overage:.2f}x over limit, refining via LLM", "DEBUG", module="IterativeRefiner")
             reduction = 10 * (iteration + 1)
             refined_text = refine_section_via_llm(text, reduction, section_name)
-            log_process(f"{section_name} iteration {iteration+1}: {len(refined_text)} chars, {estimate_tokens(refined_text)} tokens", "DEBUG", module="IterativeRefiner")
+            log_debug_lazy(lambda: f"{section_name} iteration {iteration+1}: {len(refined_text)} chars, {estimate_tokens(refined_text)} tokens", module="IterativeRefiner")
             text = refined_text
             iteration += 1
         
         if iteration >= max_iterations:
             # Fallback to summarization.
-            with open("STATIC_DATA/prompt_templates/all_prompts.json", "r", encoding="utf-8") as f:
-                prompts = json.load(f)
+            prompts = _load_prompts()
             prompt = prompts["section_summarization_prompt"]["prompt"].format(
                 section_name=section_name,
                 max_chars=limits["max_chars"],
@@ -26,27 +26,50 @@ This module processes job description files in various formats:
 """
 
 import os
+import gzip
 import json
+import errno
 import datetime
 import shutil
+import zipfile
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
-import fitz  # For PDF extraction via PyMuPDF
 from docx import Document
+from lxml import etree  # installed with python-docx
 from bs4 import BeautifulSoup
 
-from logging_manager import log_process, log_advanced_metric
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser.
+    orjson = None
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; fall back to BeautifulSoup with lxml.
+    HTMLParser = None
+
+from logging_manager import log_process, log_advanced_metric, is_enabled, log_debug_lazy
 from config_manager import CONFIG
 from api_interface import call_api
-from helpers import partial_json_salvage
+from helpers import loads_or_salvage, sequential_id, docx_text, cached_file_text
+from pdf_text import extract_pdf_text
 
 # Type alias for JSON data.
 JSONType = Dict[str, Any]
 FilePath = Union[str, Path]
 
+# Strict JSON parser for API responses (orjson's JSONDecodeError subclasses json's).
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Body of the first ``` / ```json fenced block in an API response.
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+# Normalizes single-quoted pseudo-JSON in the fallback cleanup path.
+_QUOTE_TRANS = str.maketrans("'", '"')
+
 @dataclass
 class JobData:
     """
@@ -89,23 +112,40 @@ def extract_text_from_file(file_path: FilePath) -> Optional[str]:
     """
     Extracts text from a file based on its extension.
     Supports: TXT, PDF, DOCX, and HTML.
+    Results are cached in memory and on disk by helpers.cached_file_text.
     """
     file_path = Path(file_path)
+    try:
+        return cached_file_text(file_path, _read_text_from_file, "job")
+    except OSError as e:
+        log_process(f"Error reading {file_path.name}: {e}", "ERROR", module="JobExtractor")
+        return None
+
+def _read_text_from_file(file_path: Path) -> Optional[str]:
+    """
+    Parses a file's text based on its extension (uncached).
+    """
     try:
         if file_path.suffix.lower() == ".txt":
             return file_path.read_text(encoding="utf-8")
         elif file_path.suffix.lower() == ".pdf":
-            text = []
-            with fitz.open(str(file_path)) as doc:
-                for page in doc:
-                    text.append(page.get_text("text"))
-            return "\n".join(text)
+            # Multi-page PDFs are decoded across worker processes (see pdf_text).
+            return extract_pdf_text(str(file_path))
         elif file_path.suffix.lower() == ".docx":
-            doc = Document(file_path)
-            return "\n".join(para.text for para in doc.paragraphs)
+            # Stream paragraph text straight from word/document.xml, skipping empty paragraphs;
+            # python-docx is only loaded if the document part cannot be parsed directly.
+            try:
+                return docx_text(file_path, skip_empty=True)
+            except (KeyError, OSError, zipfile.BadZipFile, etree.XMLSyntaxError):
+                pass  # Not a plain WordprocessingML package; let python-docx handle it.
+            return "\n".join(text for text in (para.text for para in Document(file_path).paragraphs) if text)
         elif file_path.suffix.lower() == ".html":
             html = file_path.read_text(encoding="utf-8")
-            soup = BeautifulSoup(html, "html.parser")
+            if HTMLParser is not None:
+                # selectolax (lexbor) parses and walks the tree in C, without BeautifulSoup's Python objects.
+                return HTMLParser(html).text(separator="\n")
+            # lxml (already required by python-docx) is a C parser, much faster than "html.parser".
+            soup = BeautifulSoup(html, "lxml")
             return soup.get_text(separator="\n")
         else:
             raise JobExtractionError(f"Unsupported file type: {file_path.suffix}")
@@ -120,7 +160,7 @@ def clean_api_response(response: Any) -> Dict[str, str]:
     attempts to salvage partial JSON using regex.
     Returns a dictionary with default values on failure.
     """
-    log_process(f"Initial raw API response type: {type(response)}", "DEBUG", module="JobExtractor")
+    log_debug_lazy(lambda: f"Initial raw API response type: {type(response)}", module="JobExtractor")
     default_data = {
         "Title": "UNKNOWN",
         "Company Name": "UNKNOWN",
@@ -136,65 +176,94 @@ def clean_api_response(response: Any) -> Dict[str, str]:
             response = response.content
         
         if isinstance(response, str):
-            if "```json" in response:
-                response = response.split("```json", 1)[1].split("```", 1)[0]
-            elif "```" in response:
-                response = response.split("```", 1)[1].split("```", 1)[0]
-            start_idx = response.find('{')
-            end_idx = response.rfind('}')
-            if start_idx != -1 and end_idx != -1:
-                response = response[start_idx:end_idx+1]
-            response = response.strip().replace("'", '"')
+            # Fast path: well-formed JSON (the usual case in json_mode) skips the cleanup below.
             try:
-                parsed = json.loads(response)
-            except json.JSONDecodeError as e:
-                log_process(f"JSON parsing failed: {e}", "DEBUG", module="JobExtractor")
-                if CONFIG["ALLOW_PARTIAL_JSON_PARSE"]:
-                    parsed = partial_json_salvage(response)
-                else:
-                    raise e
+                parsed = _json_loads(response)
+            except json.JSONDecodeError:
+                parsed = None
+            if not isinstance(parsed, dict):
+                fence = _FENCE_RE.search(response)
+                if fence:
+                    response = fence.group(1)
+                start_idx = response.find('{')
+                end_idx = response.rfind('}')
+                if start_idx != -1 and end_idx != -1:
+                    response = response[start_idx:end_idx+1]
+                response = response.strip().translate(_QUOTE_TRANS)
+                parsed, partial = loads_or_salvage(response, expect=dict)
+                if partial:
+                    log_process("JSON parsing failed; using partially salvaged fields", "DEBUG", module="JobExtractor")
         else:
             parsed = response
         
         result = default_data.copy()
         result.update({k: str(v) for k, v in parsed.items() if k in default_data})
-        log_process(f"Cleaned data: {json.dumps(result)}", "DEBUG", module="JobExtractor")
+        if is_enabled("DEBUG"):
+            log_process(f"Cleaned data: {json.dumps(result)}", "DEBUG", module="JobExtractor")
         return result
         
     except Exception as e:
         log_process(f"Failed to clean API response: {e}", "ERROR", module="JobExtractor")
         return default_data
 
+@lru_cache(maxsize=1)
+def _load_prompts() -> JSONType:
+    """
+    Loads STATIC_DATA/prompt_templates/all_prompts.json once and caches the parsed prompts.
+    """
+    prompts_path = Path("STATIC_DATA/prompt_templates/all_prompts.json")
+    if not prompts_path.exists():
+        raise JobExtractionError(f"Prompt file not found at {prompts_path}")
+    with open(prompts_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=1)
+def _job_prompt_parts() -> Tuple[str, str, str]:
+    """
+    Returns (prefix, suffix, system_message) for 'job_extraction_prompt'.
+
+    The template is split once around its {raw_text} slot, so each extraction is a plain
+    concatenation. str.format cannot be used here: the template embeds a literal JSON example.
+    """
+    prompt_data = _load_prompts()["job_extraction_prompt"]
+    prefix, _, suffix = prompt_data["prompt"].partition("{raw_text}")
+    return prefix, suffix, prompt_data["system_message"]
+
+def _is_job_json(response: str) -> bool:
+    """
+    Returns True if response is a clean JSON object with a Title (safe to cache and replay).
+    """
+    parsed = _json_loads(response.strip())
+    return isinstance(parsed, dict) and bool(parsed.get("Title"))
+
 def extract_job_data(raw_text: str, file_name: str) -> JobData:
     """
     Extracts structured job data by calling the LLM API.
     
     Process:
-    - Loads the extraction prompt from STATIC_DATA/prompt_templates/all_prompts.json.
-    - Replaces {raw_text} in the prompt.
-    - Calls call_api to get the response.
+    - Takes the cached extraction prompt from STATIC_DATA/prompt_templates/all_prompts.json.
+    - Inserts the text (truncated to MAX_EXTRACTION_CHARS) into the pre-split prompt's {raw_text} slot.
+    - Calls call_api at temperature 0 to get the response (cacheable once it parses as job JSON).
     - Attempts to parse the response as JSON; if it fails, uses clean_api_response.
     - Normalizes fields (e.g., posting_date) and adds metadata.
     """
     try:
-        prompts_path = Path("STATIC_DATA/prompt_templates/all_prompts.json")
-        if not prompts_path.exists():
-            raise JobExtractionError(f"Prompt file not found at {prompts_path}")
-        with open(prompts_path, "r", encoding="utf-8") as f:
-            prompts = json.load(f)
+        prefix, suffix, system_message = _job_prompt_parts()
+        # Only the prompt is truncated; JobData keeps the full raw_text. The text is the
+        # template's last slot, so the static instructions form a cacheable prefix.
+        extraction_prompt = prefix + raw_text[:CONFIG["MAX_EXTRACTION_CHARS"]] + suffix
         
-        extraction_prompt = prompts["job_extraction_prompt"]["prompt"].format(raw_text=raw_text)
-        system_message = prompts["job_extraction_prompt"]["system_message"]
-        
-        log_process(f"Extraction Prompt (truncated): {extraction_prompt[:200]}...", "DEBUG", module="JobExtractor")
+        if is_enabled("DEBUG"):
+            log_process(f"Extraction Prompt (truncated): {extraction_prompt[:200]}...", "DEBUG", module="JobExtractor")
         log_process("Initiating API call for job extraction", "DEBUG", module="JobExtractor")
         
-        result = call_api(prompt=extraction_prompt, system_message=system_message)
+        # Extraction is deterministic (temperature 0); only a clean JSON object may be cached.
+        result = call_api(prompt=extraction_prompt, system_message=system_message, temperature=0, cache_if=_is_job_json)
         if not result:
             raise JobExtractionError("Empty API response")
         
         try:
-            job_data = json.loads(result.strip())
+            job_data = _json_loads(result.strip())
         except Exception as e:
             log_process(f"Direct JSON parsing failed: {e}", "DEBUG", module="JobExtractor")
             job_data = clean_api_response(result)
@@ -203,7 +272,8 @@ def extract_job_data(raw_text: str, file_name: str) -> JobData:
             job_data["posting_date"] = job_data["posting_date"].split("Apply by")[-1].strip()
         
         job_data.update({
-            "jid": datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
+            # Run timestamp + counter keeps IDs (and EXT-<jid>.json names) distinct across concurrent jobs.
+            "jid": sequential_id(),
             "raw_text": raw_text,
             "source_file": file_name,
             "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -222,14 +292,23 @@ def move_original_file(job_file: Path, jid: str, field_info: Dict[str, Any]) ->
     done_dir.mkdir(parents=True, exist_ok=True)
     field_abbr = field_info.get("short_name", "UNK")
     new_filename = f"{field_abbr}-{jid}_{job_file.name}"
+    destination = done_dir / new_filename
     try:
-        shutil.move(str(job_file), str(done_dir / new_filename))
+        # A same-filesystem rename is O(1); only fall back to copy+delete across devices.
+        try:
+            job_file.rename(destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(str(job_file), str(destination))
     except Exception as e:
         raise JobExtractionError(f"Failed to move job file to DONE: {e}")
 
 def save_job_data(job_data: JobData, field_info: Dict[str, Any]) -> Path:
     """
     Saves the extracted job data as a JSON file in a structured directory.
+    raw_text is not embedded in the JSON: with STORE_RAW_TEXT it is written to a sibling
+    EXT-<jid>.txt.gz referenced by "raw_text_file"; otherwise it is omitted.
     
     Returns the path to the saved file.
     """
@@ -237,15 +316,25 @@ def save_job_data(job_data: JobData, field_info: Dict[str, Any]) -> Path:
     output_dir = Path(CONFIG.get("EXTRACTED_DATA_DIR", "EXTRACTED_DATA")) / "job_description" / field_abbr
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / f"EXT-{job_data.jid}.json"
+    # Shallow merge over the instance dict (no dataclasses.asdict deep copy); orjson serializes it to bytes in one pass.
     merged_dict = {
-        **job_data.__dict__,
+        **vars(job_data),
         "field_id": field_info.get("id", 1),
         "field_long_name": field_info.get("long_name", job_data.field),
         "field_short_name": field_info.get("short_name", job_data.field[:3])
     }
+    del merged_dict["raw_text"]
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(merged_dict, f, indent=2)
+        if CONFIG["STORE_RAW_TEXT"]:
+            raw_text_path = output_dir / f"EXT-{job_data.jid}.txt.gz"
+            with gzip.open(raw_text_path, "wb") as f:
+                f.write(job_data.raw_text.encode("utf-8"))
+            merged_dict["raw_text_file"] = raw_text_path.name
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(merged_dict, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(merged_dict, f, indent=2)
         return output_path
     except Exception as e:
         raise JobExtractionError(f"Failed to save job data: {e}")
@@ -265,7 +354,8 @@ def process_job_file(job_file: FilePath) -> Optional[JobData]:
         raw_text = extract_text_from_file(job_file)
         if not raw_text:
             raise JobExtractionError("Text extraction failed")
-        log_process(f"Extracted text (first 1000 chars): {raw_text[:1000]}...", "DEBUG", module="JobExtractor")
+        if is_enabled("DEBUG"):
+            log_process(f"Extracted text (first 1000 chars): {raw_text[:1000]}...", "DEBUG", module="JobExtractor")
         job_data = extract_job_data(raw_text, job_file.name)
         log_process(f"Extracted job data: {job_data.title} at {job_data.company}", "INFO", module="JobExtractor")
         field_info = {
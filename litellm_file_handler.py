@@ -9,7 +9,7 @@ Plan:
     Use a requests session with retry and connection pooling.
     Validate responses and log details.
     Provide a wrapper function call_litellm used by api_interface.
-    Include a test function for API connection.
+    Include a test function for API connection (run by main.validate_environment).
 '''
 
 """
@@ -17,18 +17,18 @@ LiteLLM File Handler Module
 
 This module provides an interface to call LLM APIs (e.g., OpenAI and OpenRouter)
 with built-in retry logic, connection pooling, and detailed logging.
-- Uses tenacity for retrying API calls.
+- Retries are left to api_interface.call_api (recoverable errors, jittered backoff); no per-call retry wrapper here.
 - Validates responses and logs metrics.
 - Exposes the call_litellm() function for use by api_interface.
 """
 
 import json
 import time
-from datetime import datetime
+import atexit
+import threading
 from typing import Dict, Optional, Any, List, Union
 from dataclasses import dataclass
 from functools import lru_cache
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -36,12 +36,8 @@ from urllib3.util.retry import Retry
 import os
 
 from config_manager import CONFIG, get_openai_api_key
-from logging_manager import log_process, log_api_call
-
-# Retrieve the OpenAI API key (required even if using other providers).
-api_key = get_openai_api_key()
-if not api_key:
-    raise ValueError("OpenAI API key is not set. Please check your configuration.")
+from logging_manager import log_process, log_api_call, log_debug_lazy
+from helpers import sequential_id
 
 # In a real implementation, you would instantiate the actual OpenAI client.
 # For this example, we will mock responses in the call_openai() method.
@@ -59,8 +55,10 @@ class LLMResponse:
     latency: float
 
 class LLMError(Exception):
-    """Custom exception for LLM-related errors."""
-    pass
+    """Custom exception for LLM-related errors. Carries the provider HTTP status when there was one."""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 class LLMHandler:
     """
@@ -79,7 +77,8 @@ class LLMHandler:
         """
         session = requests.Session()
         retries = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
+        # Size the per-host pool for concurrent batch callers so TLS connections are reused, not re-opened.
+        adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=CONFIG["HTTP_POOL_MAXSIZE"])
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         return session
@@ -87,9 +86,12 @@ class LLMHandler:
     def _configure_apis(self) -> None:
         """
         Configures API clients.
+        For OpenAI, requires the API key (raises ValueError if missing).
         For OpenRouter, sets up the necessary headers.
         """
         if CONFIG["LLM_PROVIDER"] == "openai":
+            # The OpenAI key is only required when OpenAI is the configured provider.
+            get_openai_api_key()
             log_process("OpenAI client is assumed to be configured externally.", "INFO", module="LiteLLMHandler")
         self.openrouter_headers = {
             "Authorization": f"Bearer {os.getenv('API_KEY_OPENROUTER', '')}",
@@ -114,7 +116,6 @@ class LLMHandler:
         if not isinstance(response["choices"][0], dict) or "message" not in response["choices"][0]:
             raise LLMError("Invalid choice structure")
     
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def call_openai(self, messages: List[Dict[str, str]], model: Optional[str] = None, **kwargs: Any) -> LLMResponse:
         """
         Makes an API call to OpenAI.
@@ -122,7 +123,7 @@ class LLMHandler:
         """
         log_process("Making OpenAI API call...", "DEBUG", module="LiteLLMHandler")
         start_time = time.time()
-        call_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        call_id = sequential_id()
         
         request_data = {
             "messages": messages,
@@ -130,6 +131,10 @@ class LLMHandler:
             "max_tokens": kwargs.get("max_tokens", 512),
             "temperature": kwargs.get("temperature", 0.7)
         }
+        if "response_format" in kwargs:
+            request_data["response_format"] = kwargs["response_format"]
+        if CONFIG["API_LATENCY_OPTIMIZED"]:
+            request_data["service_tier"] = "priority"
         log_api_call(
             endpoint="openai_request",
             request_data=request_data,
@@ -169,13 +174,18 @@ class LLMHandler:
         """
         log_process("Making OpenRouter API call...", "DEBUG", module="LiteLLMHandler")
         start_time = time.time()
-        call_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        call_id = sequential_id()
         data = {
             "model": model or CONFIG["DEFAULT_MODEL"],
             "messages": messages,
             "max_tokens": kwargs.get("max_tokens", 512),
             "temperature": kwargs.get("temperature", 0.7)
         }
+        if "response_format" in kwargs:
+            data["response_format"] = kwargs["response_format"]
+        if CONFIG["API_LATENCY_OPTIMIZED"]:
+            # Prefer the lowest-latency upstream provider for this model.
+            data["provider"] = {"sort": "latency"}
         log_api_call(
             endpoint="openrouter_request",
             request_data=data,
@@ -200,7 +210,7 @@ class LLMHandler:
                 error=error_msg,
                 call_id=call_id
             )
-            raise LLMError(error_msg)
+            raise LLMError(error_msg, status_code=response.status_code)
         response_dict = response.json()
         self.validate_response(response_dict)
         latency = time.time() - start_time
@@ -232,14 +242,15 @@ class LLMHandler:
         else:
             raise LLMError(f"Unsupported LLM provider: {provider}")
 
-def test_api_connection() -> bool:
+def test_api_connection(handler: Optional["LLMHandler"] = None) -> bool:
     """
     Tests the API connection by sending a simple prompt.
+    Uses the given handler (default: the module-wide handler) so its pooled session is reused.
     Returns True if the response is as expected.
     """
     try:
         log_process("Testing API connection with simple prompt", "INFO", module="LiteLLMHandler")
-        call_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        call_id = sequential_id()
         messages = [{"role": "user", "content": "respond with \"working\" - do not add any other text"}]
         log_api_call(
             endpoint="test_request",
@@ -250,7 +261,7 @@ def test_api_connection() -> bool:
             call_id=call_id
         )
         # Make a simple API call.
-        response = self = LLMHandler().call_api(messages, model=CONFIG["DEFAULT_MODEL"])
+        response = (handler or get_handler()).call_api(messages, model=CONFIG["DEFAULT_MODEL"])
         response_text = response.content.strip().lower().replace('"', '').replace("'", "")
         is_working = response_text == "working"
         if is_working:
@@ -262,23 +273,37 @@ def test_api_connection() -> bool:
         log_process(f"API connection test failed with error: {e}", "ERROR", module="LiteLLMHandler")
         return False
 
-# Initialize a global handler instance and test the connection.
-_handler = LLMHandler()
-if not test_api_connection():
-    raise LLMError("Failed to establish working API connection")
+# Module-wide handler, created on first use so importing this module has no side effects
+# (PDF worker processes re-import the main script's modules).
+_handler: Optional[LLMHandler] = None
+_HANDLER_LOCK = threading.Lock()
+
+def get_handler() -> LLMHandler:
+    """
+    Returns the module-wide LLMHandler, creating it on first use.
+    """
+    global _handler
+    with _HANDLER_LOCK:
+        if _handler is None:
+            _handler = LLMHandler()
+            # Close the pooled keep-alive connections cleanly at interpreter exit.
+            atexit.register(_handler.session.close)
+        return _handler
 
-def call_litellm(prompt: str, system_message: Optional[str] = None, model: Optional[str] = None) -> str:
+def call_litellm(prompt: str, system_message: Optional[str] = None, model: Optional[str] = None, json_mode: bool = False, max_tokens: Optional[int] = None, temperature: Optional[float] = None) -> str:
     """
     Wrapper function to call the LLM using the global handler.
     Logs the request and response, then returns the content.
+    With json_mode, the provider is asked for a JSON object response (response_format=json_object).
+    max_tokens and temperature, if given, override the handler defaults (512 tokens, 0.7).
     """
     try:
-        call_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        call_id = sequential_id()
         messages = []
         if system_message:
-            log_process(f"System Message: {system_message}", "DEBUG", module="LiteLLMHandler")
+            log_debug_lazy(lambda: f"System Message: {system_message}", module="LiteLLMHandler")
             messages.append({"role": "system", "content": system_message})
-        log_process(f"API Prompt: {prompt}", "DEBUG", module="LiteLLMHandler")
+        log_debug_lazy(lambda: f"API Prompt: {prompt}", module="LiteLLMHandler")
         messages.append({"role": "user", "content": prompt})
         log_api_call(
             endpoint="litellm_request",
@@ -288,7 +313,12 @@ def call_litellm(prompt: str, system_message: Optional[str] = None, model: Optio
             error=None,
             call_id=call_id
         )
-        response = _handler.call_api(messages, model=model)
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        if max_tokens:
+            extra["max_tokens"] = max_tokens
+        if temperature is not None:
+            extra["temperature"] = temperature
+        response = get_handler().call_api(messages, model=model, **extra)
         log_api_call(
             endpoint="litellm_response",
             request_data={"prompt": prompt, "system_message": system_message, "model": model or CONFIG["DEFAULT_MODEL"]},
@@ -308,6 +338,6 @@ def call_litellm(prompt: str, system_message: Optional[str] = None, model: Optio
             error=error_msg,
             call_id=call_id
         )
-        raise LLMError(error_msg)
+        raise LLMError(error_msg, status_code=getattr(e, "status_code", None)) from e
 
 # End of litellm_file_handler.py
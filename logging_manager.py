@@ -7,7 +7,7 @@
 Plan:
 
     Log events to JSONL files (one for general events and one for advanced metrics).
-    If ENABLE_CSV_EXPORT is true, also export minimal log entries to CSV.
+    If ENABLE_CSV_EXPORT is true, export minimal log entries to CSV (in batch from the JSONL log, at exit).
     Include timestamp, log level, and module name in each log entry.
     Provide a helper function log_process for use across modules.
     
@@ -18,16 +18,30 @@ Logging Manager Module
 
 This module implements centralized logging:
 - All events are logged in a JSON Lines (JSONL) file.
+- JSONL files are kept open with buffered writes, flushed every LOG_FLUSH_INTERVAL seconds and at exit.
 - Advanced metrics (such as full n-gram distributions, API latencies, etc.) are logged separately.
-- Optionally exports critical logs to CSV if ENABLE_CSV_EXPORT is enabled.
+- Structured API call records (log_api_call) go to the advanced metrics file.
+- Optionally exports logs to CSV: in batch from the JSONL file at exit if ENABLE_CSV_EXPORT is enabled,
+  or on demand with `python logging_manager.py export_csv`.
+- log_process drops records below LOG_LEVEL; is_enabled/log_debug_lazy let callers skip building them.
 - Each log entry includes a timestamp, log level, and module name for later ELK ingestion.
 """
 
 import os
 import json
+import time
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
+from typing import Callable
 import csv
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib serializer.
+    orjson = None
+
 from config_manager import CONFIG
 
 # Define paths for log files.
@@ -38,6 +52,80 @@ CSV_LOG_PATH = Path("LOGS/log_export.csv")
 # Ensure that the log directory exists.
 LOG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Numeric severities for log_process level filtering.
+_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+
+def _level_int(level: str) -> int:
+    """
+    Maps a level name to its numeric severity (unknown names count as INFO).
+    """
+    return _LEVELS.get(level.upper(), _LEVELS["INFO"])
+
+# Records below this level are dropped by log_process.
+CURRENT_LOG_LEVEL = _level_int(CONFIG.get("LOG_LEVEL", "INFO"))
+
+def is_enabled(level: str) -> bool:
+    """
+    Returns True if log_process would record a message at this level.
+    Call sites use it to skip building expensive DEBUG messages.
+    """
+    return _level_int(level) >= CURRENT_LOG_LEVEL
+
+# Seconds between background flushes of the buffered JSONL handles.
+LOG_FLUSH_INTERVAL = 1.0
+
+# JSONL files stay open for the life of the process; writes are buffered and serialized by _LOG_LOCK.
+_LOG_LOCK = threading.Lock()
+_LOG_FH = LOG_FILE_PATH.open("ab", buffering=1 << 16)
+_ADVANCED_LOG_FH = ADVANCED_LOG_FILE_PATH.open("ab", buffering=1 << 16)
+
+def _append_line(fh, path: Path, line: bytes) -> None:
+    """
+    Appends a serialized line to a buffered log handle (or straight to path once the handle is closed at exit).
+    """
+    with _LOG_LOCK:
+        if fh.closed:
+            with path.open("ab") as f:
+                f.write(line)
+        else:
+            fh.write(line)
+
+def flush_logs() -> None:
+    """
+    Flushes buffered JSONL log records to disk.
+    """
+    with _LOG_LOCK:
+        for fh in (_LOG_FH, _ADVANCED_LOG_FH):
+            if not fh.closed:
+                fh.flush()
+
+def _flush_periodically() -> None:
+    """
+    Background loop that flushes the log handles every LOG_FLUSH_INTERVAL seconds.
+    """
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_logs()
+
+def _close_logs() -> None:
+    """
+    Flushes and closes the log handles at interpreter exit.
+    """
+    with _LOG_LOCK:
+        _LOG_FH.close()
+        _ADVANCED_LOG_FH.close()
+
+threading.Thread(target=_flush_periodically, name="log-flusher", daemon=True).start()
+atexit.register(_close_logs)
+
+def _jsonl_line(data: dict) -> bytes:
+    """
+    Serializes one log record as a UTF-8 JSON line (orjson when installed).
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, default=str) + "\n").encode("utf-8")
+
 def log_json(data: dict, level: str = "INFO", module: str = "") -> None:
     """
     Logs a general event by appending a JSON object to the JSONL log file.
@@ -53,41 +141,59 @@ def log_json(data: dict, level: str = "INFO", module: str = "") -> None:
     if module:
         data["module"] = module
     
-    # Write the JSON entry to the log file.
-    with LOG_FILE_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(data) + "\n")
-    
-    # If CSV export is enabled, export a simplified log entry.
-    if CONFIG["ENABLE_CSV_EXPORT"]:
-        export_log_to_csv(data)
+    # Write the JSON entry to the log file (CSV is produced from it in batch; see export_logs_to_csv).
+    _append_line(_LOG_FH, LOG_FILE_PATH, _jsonl_line(data))
 
 def log_advanced_metric(data: dict) -> None:
     """
     Logs detailed advanced metrics (e.g. n-gram frequencies, API latency) to a separate JSONL file.
     """
     data.setdefault("timestamp", datetime.utcnow().isoformat() + "Z")
-    with ADVANCED_LOG_FILE_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(data) + "\n")
+    _append_line(_ADVANCED_LOG_FH, ADVANCED_LOG_FILE_PATH, _jsonl_line(data))
 
-def export_log_to_csv(data: dict) -> None:
+def log_api_call(endpoint: str, request_data: dict, response_data: dict, success: bool, error: str = None, call_id: str = None) -> None:
     """
-    Exports a log entry to a CSV file for quick, spreadsheet-friendly analysis.
+    Logs a structured API request/response record to the advanced metrics JSONL file.
     """
-    fieldnames = ["timestamp", "level", "module", "message"]
-    # Extract a simplified message.
-    message = data.get("message", "")
-    row = {
-        "timestamp": data.get("timestamp", ""),
-        "level": data.get("level", ""),
-        "module": data.get("module", ""),
-        "message": message
-    }
-    file_exists = CSV_LOG_PATH.exists()
-    with CSV_LOG_PATH.open("a", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(row)
+    log_advanced_metric({
+        "type": "api_call",
+        "call_id": call_id,
+        "endpoint": endpoint,
+        "success": success,
+        "error": error,
+        "request": request_data,
+        "response": response_data
+    })
+
+def export_logs_to_csv(jsonl_path: Path = LOG_FILE_PATH, csv_path: Path = CSV_LOG_PATH) -> int:
+    """
+    Exports the JSONL event log to a CSV file for quick, spreadsheet-friendly analysis.
+    Streams the log in one pass and rewrites the CSV with a single header. Returns the row count.
+    """
+    flush_logs()
+    if not jsonl_path.exists():
+        return 0
+    loads = orjson.loads if orjson is not None else json.loads
+    rows = 0
+    with jsonl_path.open("rb") as src, csv_path.open("w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=["timestamp", "level", "module", "message"], extrasaction="ignore", restval="")
+        writer.writeheader()
+        for line in src:
+            try:
+                writer.writerow(loads(line))
+            except ValueError:
+                continue  # skip a partially written trailing line
+            rows += 1
+    return rows
+
+def _export_csv_at_exit() -> None:
+    """
+    Regenerates the CSV export at interpreter exit when ENABLE_CSV_EXPORT is set.
+    """
+    if CONFIG["ENABLE_CSV_EXPORT"]:
+        export_logs_to_csv()
+
+atexit.register(_export_csv_at_exit)
 
 def log_process(message: str, level: str = "INFO", immediate: bool = False, module: str = "") -> None:
     """
@@ -100,7 +206,10 @@ def log_process(message: str, level: str = "INFO", immediate: bool = False, modu
     - module: The module name generating the log.
     
     This function is used by all modules to trace the flow of data and actions.
+    Messages below LOG_LEVEL are discarded.
     """
+    if not is_enabled(level):
+        return
     log_entry = {
         "message": message,
         "module": module
@@ -117,4 +226,19 @@ def log_process(message: str, level: str = "INFO", immediate: bool = False, modu
     }.get(level.upper(), "[INFO]")
     print(f"{prefix} {message}")
 
+def log_debug_lazy(build_message: Callable[[], str], module: str = "") -> None:
+    """
+    Logs a DEBUG message built by build_message, which is only called if DEBUG is enabled.
+    """
+    if is_enabled("DEBUG"):
+        log_process(build_message(), "DEBUG", module=module)
+
+if __name__ == "__main__":
+    # python logging_manager.py export_csv
+    import sys
+    if sys.argv[1:] == ["export_csv"]:
+        print(f"Exported {export_logs_to_csv()} log entries to {CSV_LOG_PATH}")
+    else:
+        print("Usage: python logging_manager.py export_csv")
+
 # End of logging_manager.py
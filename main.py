@@ -16,8 +16,6 @@ Plan:
 '''
 
 
-Code:
-
 """
 Main Module
 
@@ -36,17 +34,22 @@ import os
 import sys
 import time
 import shutil
+import queue
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
 
 from config_manager import CONFIG
 from logging_manager import log_process
 from job_extractor import process_job_files
 from resume_builder import build_final_resume
-from match_optimizer import optimize_match
+from match_optimizer import optimize_match, load_resume_corpus, load_resume_aggregates, MatchOptimizerError
+from litellm_file_handler import test_api_connection
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingStats:
     """
     Container for processing statistics.
@@ -77,29 +80,70 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--cleanup", action="store_true", help="Clean up temporary files after processing")
     return parser.parse_args()
 
+def _ensure_directory(path: str) -> str:
+    """
+    Creates path if it does not exist and returns its verification line.
+    """
+    # isdir avoids a mkdir syscall in the usual case where the directory already exists.
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+    return f"[OK] Verified directory: {path}"
+
+def _check_template(template_path: Path) -> None:
+    """
+    Raises ProcessingError if the resume template file is missing.
+    """
+    if not template_path.exists():
+        raise ProcessingError(f"Resume template not found: {template_path}")
+
 def validate_environment() -> None:
     """
-    Validates that required directories and template files exist.
+    Validates that required directories and template files exist, and that the LLM API answers.
+    The filesystem checks are independent, so they run concurrently (stat latency matters on
+    network filesystems) and validation stops at the first failure.
     """
     try:
         print("\nValidating environment...")
-        required_dirs = ["INPUT_JOBS_DIR", "INPUT_RESUME_DIR", "EXTRACTED_DATA_DIR", "FINISHED_JOB_RESUME_DIR", "STATIC_DATA"]
-        for key in required_dirs:
-            path = Path(CONFIG.get(key, key))
-            path.mkdir(parents=True, exist_ok=True)
-            print(f"[OK] Verified directory: {path}")
-        
-        if not CONFIG.get("API_KEY_OPENAI"):
+        if CONFIG["LLM_PROVIDER"] == "openai" and not CONFIG.get("API_KEY_OPENAI"):
             raise ProcessingError("Missing API key for OpenAI")
         
+        required_dirs = ["INPUT_JOBS_DIR", "INPUT_RESUME_DIR", "EXTRACTED_DATA_DIR", "FINISHED_JOB_RESUME_DIR", "STATIC_DATA"]
         template_path = Path(CONFIG.get("STATIC_DATA_DIR", "STATIC_DATA")) / "prompt_templates" / "template-resume.docx"
-        if not template_path.exists():
-            raise ProcessingError(f"Resume template not found: {template_path}")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            dir_futures = [executor.submit(_ensure_directory, CONFIG.get(key, key)) for key in required_dirs]
+            template_future = executor.submit(_check_template, template_path)
+            done, _ = wait(dir_futures + [template_future], return_when=FIRST_EXCEPTION)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    raise ProcessingError(str(error)) from error
+        print("\n".join(future.result() for future in dir_futures))
         
+        if not test_api_connection():
+            raise ProcessingError("Failed to establish working API connection")
+        print("[OK] API connection")
         print("Environment validation complete!\n")
     except Exception as e:
         raise ProcessingError(f"Environment validation failed: {e}")
 
+def _remove_trees(paths: List[Path]) -> None:
+    """
+    Deletes each directory tree in paths, ignoring errors (runs on a background thread).
+    """
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+def sweep_stale_temp_dirs() -> None:
+    """
+    Deletes TEMP.old.* directories left behind when an earlier run exited (or crashed)
+    before its background cleanup finished. The deletion runs on a background thread.
+    """
+    temp_dir = Path(CONFIG.get("TEMP_DIR", "TEMP"))
+    stale_dirs = [path for path in temp_dir.parent.glob(f"{temp_dir.name}.old.*") if path.is_dir()]
+    if stale_dirs:
+        log_process(f"Removing {len(stale_dirs)} stale temp director{'y' if len(stale_dirs) == 1 else 'ies'}", "INFO", module="Main")
+        threading.Thread(target=_remove_trees, args=(stale_dirs,), name="temp-sweep").start()
+
 def cleanup_temp_files() -> None:
     """
     Cleans up temporary files and directories.
@@ -108,21 +152,46 @@ def cleanup_temp_files() -> None:
         print("\nCleaning up temporary files...")
         temp_dir = Path(CONFIG.get("TEMP_DIR", "TEMP"))
         if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+            # Swap in an empty directory with an O(1) rename; the old tree is deleted in the background.
+            # A leftover from an earlier run with the same pid may still hold the name; pick the next free one.
+            stale_dir = temp_dir.with_name(f"{temp_dir.name}.old.{os.getpid()}")
+            suffix = 0
+            while stale_dir.exists():
+                suffix += 1
+                stale_dir = temp_dir.with_name(f"{temp_dir.name}.old.{os.getpid()}.{suffix}")
+            os.rename(temp_dir, stale_dir)
             temp_dir.mkdir(exist_ok=True)
+            threading.Thread(target=_remove_trees, args=([stale_dir],), name="temp-cleanup").start()
             print(f"[OK] Cleaned temp directory: {temp_dir}")
         print("Cleanup complete!\n")
     except Exception as e:
         print(f"[WARN] Cleanup warning: {e}")
 
+def _iter_files(directory: str, suffixes: Optional[Tuple[str, ...]] = None) -> Iterator[str]:
+    """
+    Yields the paths of regular files in directory (non-recursive) via os.scandir.
+    With suffixes, only names ending in one of them; otherwise any name with an extension.
+    Dotfiles (.gitkeep, .DS_Store) are skipped, as glob("*.*") skips them.
+    """
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_file() and (entry.name.endswith(suffixes) if suffixes else "." in entry.name):
+                yield entry.path
+
 def process_pipeline(jobs_dir: str, resumes_dir: str) -> None:
     """
     Executes the processing pipeline.
     
     Flow:
     - Process resume files (placeholder: increases resumes_processed count).
-    - Process job files via process_job_files.
-    - For each job, perform match optimization and build the final resume.
+    - Stream job files through extractor threads into a bounded queue drained by optimizer
+      threads, which optimize each job and build its final resume.
     - Log statistics.
     """
     stats = ProcessingStats(start_time=time.time())
@@ -130,47 +199,96 @@ def process_pipeline(jobs_dir: str, resumes_dir: str) -> None:
     try:
         # Process resume files (placeholder; actual resume processing not implemented here)
         print("\n=== Processing Resume Files ===")
-        resume_files = list(Path(resumes_dir).glob("*.docx"))
+        resume_files = list(_iter_files(resumes_dir, (".docx",)))
         for resume_file in resume_files:
+            resume_name = os.path.basename(resume_file)
             try:
                 # Placeholder: assume each resume is processed successfully.
                 stats.resumes_processed += 1
-                log_process(f"Processed resume: {resume_file.name}", "INFO", module="Main")
-            except Exception as e:
-                stats.errors_encountered += 1
-                log_process(f"Failed to process resume {resume_file.name}: {e}", "ERROR", module="Main")
-        
-        # Process job files
-        print("\n=== Processing Job Files ===")
-        job_files = list(Path(jobs_dir).glob("*.*"))
-        job_results = []
-        for job_file in job_files:
-            try:
-                results = process_job_files(job_file)
-                if results:
-                    job_results.extend(results)
-                    stats.jobs_processed += 1
-                    log_process(f"Processed job: {job_file.name}", "INFO", module="Main")
+                log_process(f"Processed resume: {resume_name}", "INFO", module="Main")
             except Exception as e:
                 stats.errors_encountered += 1
-                log_process(f"Failed to process job {job_file.name}: {e}", "ERROR", module="Main")
+                log_process(f"Failed to process resume {resume_name}: {e}", "ERROR", module="Main")
         
-        # Optimize matches and build final resumes
-        print("\n=== Optimizing Matches ===")
-        for job_data in job_results:
+        # Process job files, optimize matches, and build final resumes as one streaming pipeline:
+        # extractor threads push JobData onto a bounded queue that optimizer threads drain, so
+        # optimization starts with the first extracted job and at most job_queue.maxsize
+        # extracted jobs wait in memory at a time.
+        print("\n=== Processing Job Files and Optimizing Matches ===")
+        workers = max(1, CONFIG["CONCURRENT_FILE_LIMIT"])
+        job_files = iter(list(_iter_files(jobs_dir)))  # snapshot: extracted files are moved out of jobs_dir
+        job_files_lock = threading.Lock()
+        job_queue: "queue.Queue" = queue.Queue(maxsize=workers * 4)
+        stats_lock = threading.Lock()
+        # Load (and, for similarity selection, vectorize) the resumes once for the whole run.
+        # With heuristic selection the aggregated material is the same for every job, so it is
+        # built once too; similarity selection only ranks the shared corpus per job.
+        resume_corpus = None
+        resume_aggregates = None
+        try:
+            resume_corpus = load_resume_corpus()
+            if CONFIG["RESUME_SELECTION"] != "similarity":
+                resume_aggregates = load_resume_aggregates(corpus=resume_corpus)
+        except MatchOptimizerError as e:
+            log_process(f"Resume aggregation failed: {e}", "WARNING", module="Main")
+
+        def extract_jobs() -> None:
+            # Extractor thread: take the next job file, extract it, and queue its JobData.
+            while True:
+                with job_files_lock:
+                    job_file = next(job_files, None)
+                if job_file is None:
+                    return
+                try:
+                    results = process_job_files(job_file)
+                except Exception as e:
+                    # Count the failure and keep going; an uncaught error would end this thread.
+                    log_process(f"Failed to process job file {os.path.basename(job_file)}: {e}", "ERROR", module="Main")
+                    results = []
+                with stats_lock:
+                    if results:
+                        stats.jobs_processed += 1
+                    else:
+                        stats.errors_encountered += 1
+                for job_data in results:
+                    log_process(f"Processed job: {job_data.source_file}", "INFO", module="Main")
+                    job_queue.put(job_data)
+
+        def process_single_job(job_data) -> None:
+            # Optimize one job and build its resume; runs on a worker thread.
             try:
-                log_process(f"Optimizing match for job: {job_data.jid}", "INFO", module="Main")
-                optimized_result = optimize_match(job_data)
+                optimized_result = optimize_match(job_data, resume_aggregates, resume_corpus)
                 if not optimized_result:
                     log_process("Match optimization failed", "WARNING", module="Main")
-                    continue
+                    return
                 final_path = build_final_resume(optimized_result)
                 if final_path:
-                    stats.optimizations_completed += 1
+                    with stats_lock:
+                        stats.optimizations_completed += 1
                     log_process(f"Generated final resume: {final_path}", "INFO", module="Main")
             except Exception as e:
-                stats.errors_encountered += 1
+                with stats_lock:
+                    stats.errors_encountered += 1
                 log_process(f"Failed to optimize job {job_data.jid}: {e}", "ERROR", module="Main")
+
+        def optimize_jobs() -> None:
+            # Optimizer thread: drain the queue until the None sentinel.
+            while True:
+                job_data = job_queue.get()
+                if job_data is None:
+                    return
+                process_single_job(job_data)
+
+        extractors = [threading.Thread(target=extract_jobs, name=f"job-extract-{i}") for i in range(workers)]
+        optimizers = [threading.Thread(target=optimize_jobs, name=f"job-optimize-{i}") for i in range(workers)]
+        for thread in extractors + optimizers:
+            thread.start()
+        for thread in extractors:
+            thread.join()
+        for _ in optimizers:
+            job_queue.put(None)
+        for thread in optimizers:
+            thread.join()
         
     except Exception as e:
         raise ProcessingError(f"Pipeline execution failed: {e}")
@@ -182,7 +300,7 @@ def main() -> None:
     """
     Main entry point:
     - Parses arguments.
-    - Validates the environment.
+    - Validates the environment and sweeps temp directories left by earlier runs.
     - Runs the processing pipeline.
     - Optionally cleans up temporary files.
     """
@@ -194,6 +312,7 @@ def main() -> None:
         
         print("\n=== Resume Processing System Started ===")
         validate_environment()
+        sweep_stale_temp_dirs()
         process_pipeline(jobs_dir=args.jobs_dir, resumes_dir=args.resumes_dir)
         if args.cleanup:
             cleanup_temp_files()
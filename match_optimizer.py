@@ -9,6 +9,8 @@ Plan:
 
     Optimize a job’s matching by aggregating resume data.
     Use multi‑LLM provider selection (randomly pick from LLM_PROVIDER_LIST) when calling optimization functions.
+    Cache validated optimization results (not raw completions) when the response cache is enabled
+    and OPTIMIZER_TEMPERATURE is 0.
     Optimize objective, skills, and bullet points.
     Evaluate the match between optimized resume content and job description.
     Log advanced metrics if LOG_VERBOSE_LEVEL is advanced.
@@ -24,32 +26,119 @@ Plan:
 Match Optimizer Module
 
 This module optimizes a job's match by:
-- Aggregating resume data (for this example, a placeholder list is used).
+- Aggregating resume data (for this example, a placeholder list is used), selecting the
+  resumes most similar to the job (resume_similarity) or by a usage/length heuristic.
 - Optimizing the objective, skills, and bullet points via LLM calls.
 - Evaluating the overall match quality.
 - Using multi-LLM provider selection to add diversity to outputs.
+- Reusing validated results for identical inputs from the response cache (when enabled and
+  OPTIMIZER_TEMPERATURE is 0).
 - Logging detailed metrics if advanced logging is enabled.
 """
 
+import re
 import json
 import time
+import heapq
 import random
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser.
+    orjson = None
+
 from iterative_refiner import refine_section
 from logging_manager import log_process, log_advanced_metric
 from config_manager import CONFIG
 from api_interface import call_api
-from helpers import validate_file_path
+from response_cache import make_result_key, get_cached_result, set_cached_result
+from helpers import validate_file_path, loads_or_salvage
+from resume_similarity import QuantizedVector, rank_resumes, resume_vectors
 
 # Type alias for JSON data.
 JSONType = Dict[str, Any]
 FilePath = Union[str, Path]
 
-@dataclass
+# One skill per comma- or newline-separated run in the optimize_skills response.
+_SKILL_SPLIT_RE = re.compile(r"[^,\n]+")
+
+# Bound format method for bullet prompt lines; the template is parsed once at import.
+_BULLET_FMT = "• {}: {}".format
+
+# Static prompt scaffolding for the optimization calls, bound once at import so each
+# job only substitutes its variable fields.
+_OBJECTIVE_PROMPT = (
+    "Create a tailored overview statement for this job:\n\n"
+    "Job Description:\n{job_description}\n\n"
+    "Existing Statements:\n{combined}"
+).format
+_SKILLS_PROMPT = """Select exactly 10 most relevant skills for this job:
+
+Job Description:
+{job_description}
+
+Available Skills:
+{skills}
+
+Return as comma-separated list.""".format
+_BULLETS_PROMPT = """Optimize these bullet points for the job:
+
+Job Description:
+{job_description}
+
+Bullet Points:
+{bullet_text}
+
+Return as JSON array with 'bolded_overview' and 'description' for each bullet.""".format
+_EVALUATION_PROMPT = """Evaluate the match between this resume and the job:
+
+Job Description:
+{job_description}
+
+Resume Content:
+Objective:
+{objective}
+
+Skills:
+{skills}
+
+Experience:
+{bullets}
+
+Return JSON with:
+- match_rating (0-100)
+- explanation (detailed analysis)""".format
+
+def choose_provider() -> str:
+    """
+    Picks a model at random from LLM_PROVIDER_LIST, so each call (and each retry after an
+    invalid answer) can land on a different provider.
+    """
+    return random.choice(CONFIG["LLM_PROVIDER_LIST_PARSED"])
+
+def _cached_result(name: str, prompt: str, compute: Callable[[], Any]) -> Any:
+    """
+    Returns compute()'s result for this prompt, reusing a cached one when the response cache is enabled.
+    compute raises on an invalid LLM answer, so only validated results are ever stored.
+    As in call_api, only temperature-0 results are cached (OPTIMIZER_TEMPERATURE = 0): a sampled
+    answer is one draw among many and must not be replayed for every later run.
+    """
+    if CONFIG["OPTIMIZER_TEMPERATURE"] != 0:
+        return compute()
+    key = make_result_key(name, prompt)
+    cached = get_cached_result(key)
+    if cached is not None:
+        return cached
+    result = compute()
+    set_cached_result(key, result)
+    return result
+
+@dataclass(slots=True, frozen=True)
 class JobData:
     """
     Container for job data used during optimization.
@@ -74,7 +163,7 @@ class JobData:
             posting_date=data.get('posting_date', '')
         )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OptimizationResult:
     """
     Container for the results of the match optimization.
@@ -87,31 +176,78 @@ class OptimizationResult:
     explanation: str
     job_data: JobData
 
+@dataclass(slots=True, frozen=True)
+class ResumeAggregates:
+    """
+    Resume material shared by every job's optimization (built once per pipeline run).
+    """
+    objectives: List[str]
+    skills: List[str]
+    bullets: List[Dict[str, str]]
+
+@dataclass(slots=True, frozen=True)
+class ResumeCorpus:
+    """
+    All resume records, loaded once per pipeline run; vectors holds their similarity vectors
+    (precomputed only when RESUME_SELECTION is "similarity").
+    """
+    resumes: List[JSONType]
+    vectors: Optional[List[QuantizedVector]] = None
+
 class MatchOptimizerError(Exception):
     """Custom exception for match optimization errors."""
     pass
 
-def select_top_resumes(resumes: List[JSONType], top_n: Optional[int] = None) -> List[JSONType]:
+def _parse_llm_json(text: str, expect: type) -> Any:
     """
-    Selects the top N resumes from a list based on usage counts and content lengths.
+    Parses JSON returned by the LLM via loads_or_salvage (tolerates surrounding prose and,
+    with json5 installed, near-JSON); expect is the required top-level type (dict or list).
+    Partially salvaged results are rejected: a truncated optimization is not usable.
+    """
+    parsed, partial = loads_or_salvage(text, expect=expect)
+    if partial:
+        raise MatchOptimizerError("Truncated JSON response")
+    return parsed
+
+def select_top_resumes(resumes: List[JSONType], top_n: Optional[int] = None, job_description: Optional[str] = None, vectors: Optional[List[QuantizedVector]] = None) -> List[JSONType]:
+    """
+    Selects the top N resumes from a list.
+    With a job_description and RESUME_SELECTION "similarity", ranks by text similarity to the job
+    (vectors: precomputed resume vectors, see ResumeCorpus); otherwise by usage counts and content lengths.
     (Placeholder implementation: in a real system, resume data would be loaded from a database.)
     """
     if top_n is None:
         top_n = int(CONFIG.get("TOP_RESUME_COUNT", 5))
+    if job_description and CONFIG["RESUME_SELECTION"] == "similarity":
+        return rank_resumes(resumes, job_description, top_n, vectors)
     try:
-        return sorted(
+        # Partial selection: O(N log top_n) instead of sorting every resume.
+        return heapq.nlargest(
+            top_n,
             resumes,
             key=lambda r: (
                 r.get("usage_count", 0),
                 len(r.get("skills_list", [])),
                 len(r.get("jobs_section", []))
-            ),
-            reverse=True
-        )[:top_n]
+            )
+        )
     except Exception as e:
         log_process(f"Error sorting resumes: {e}", "ERROR", module="MatchOptimizer")
         return resumes[:top_n]
 
+def dedupe_skills(skills: Iterable[str]) -> List[str]:
+    """
+    Removes duplicate skills case-insensitively, keeping the first-seen spelling and order.
+    Empty entries are dropped.
+    """
+    unique: Dict[str, str] = {}
+    for skill in skills:
+        skill = skill.strip()
+        key = skill.lower()
+        if key and key not in unique:
+            unique[key] = skill
+    return list(unique.values())
+
 def optimize_objective(objectives: List[str], job_description: str) -> str:
     """
     Optimizes the overview/objective statement for the job.
@@ -121,13 +257,15 @@ def optimize_objective(objectives: List[str], job_description: str) -> str:
         combined = "\n".join(obj.strip() for obj in objectives if obj)
         if not combined:
             raise MatchOptimizerError("No objective statements found")
-        prompt = f"Create a tailored overview statement for this job:\n\nJob Description:\n{job_description}\n\nExisting Statements:\n{combined}"
-        providers = CONFIG["LLM_PROVIDER_LIST"].split(",")
-        chosen_provider = random.choice(providers).strip()
-        result = call_api(prompt=prompt, system_message="Return a concise, impactful overview statement.", model=chosen_provider)
-        if not result:
-            raise MatchOptimizerError("Empty API response")
-        return refine_section(result, "overview")
+        prompt = _OBJECTIVE_PROMPT(job_description=job_description, combined=combined)
+
+        def compute() -> str:
+            result = call_api(prompt=prompt, system_message="Return a concise, impactful overview statement.", model=choose_provider(), temperature=CONFIG["OPTIMIZER_TEMPERATURE"])
+            if not result:
+                raise MatchOptimizerError("Empty API response")
+            return result
+        # Refinement samples its own LLM calls, so it runs on the (possibly cached) answer, uncached.
+        return refine_section(_cached_result("optimize_objective", prompt, compute), "overview")
     except Exception as e:
         raise MatchOptimizerError(f"Failed to optimize objective: {e}")
 
@@ -138,127 +276,162 @@ def optimize_skills(skills: List[str], job_description: str) -> str:
     try:
         if not skills:
             raise MatchOptimizerError("No skills found")
-        prompt = f"""Select exactly 10 most relevant skills for this job:
-
-Job Description:
-{job_description}
-
-Available Skills:
-{', '.join(skills)}
-
-Return as comma-separated list."""
-        providers = CONFIG["LLM_PROVIDER_LIST"].split(",")
-        chosen_provider = random.choice(providers).strip()
-        result = call_api(prompt=prompt, system_message="Return exactly 10 comma-separated skills.", model=chosen_provider)
-        if not result:
-            raise MatchOptimizerError("Empty API response")
-        skill_list = [s.strip() for s in result.split(",")]
-        if len(skill_list) != 10:
-            raise MatchOptimizerError(f"Expected 10 skills, got {len(skill_list)}")
-        return ", ".join(skill_list)
+        prompt = _SKILLS_PROMPT(job_description=job_description, skills=", ".join(skills))
+
+        def compute() -> str:
+            result = call_api(prompt=prompt, system_message="Return exactly 10 comma-separated skills.", model=choose_provider(), temperature=CONFIG["OPTIMIZER_TEMPERATURE"])
+            if not result:
+                raise MatchOptimizerError("Empty API response")
+            # Blank entries (trailing commas, blank lines) are dropped rather than counted as skills.
+            skill_list = [skill for skill in (m.strip() for m in _SKILL_SPLIT_RE.findall(result)) if skill]
+            if len(skill_list) != 10:
+                raise MatchOptimizerError(f"Expected 10 skills, got {len(skill_list)}")
+            return ", ".join(skill_list)
+        return _cached_result("optimize_skills", prompt, compute)
     except Exception as e:
         raise MatchOptimizerError(f"Failed to optimize skills: {e}")
 
 def optimize_bullets(bullets: List[Dict[str, str]], job_description: str) -> List[Dict[str, str]]:
     """
     Optimizes bullet points to better match the job requirements.
+    Bullets missing a bolded_overview or description are skipped.
     Returns a JSON array (list of dictionaries) with keys 'bolded_overview' and 'description'.
     """
     try:
+        # Bullets missing an overview or a description would reach the prompt as "• : ..." noise.
+        bullets = [b for b in bullets if b.get("bolded_overview") and b.get("description")]
         if not bullets:
             raise MatchOptimizerError("No bullet points found")
-        bullet_text = "\n".join(
-            f"• {b.get('bolded_overview', '')}: {b.get('description', '')}" for b in bullets
-        )
-        prompt = f"""Optimize these bullet points for the job:
-
-Job Description:
-{job_description}
-
-Bullet Points:
-{bullet_text}
-
-Return as JSON array with 'bolded_overview' and 'description' for each bullet."""
-        providers = CONFIG["LLM_PROVIDER_LIST"].split(",")
-        chosen_provider = random.choice(providers).strip()
-        result = call_api(prompt=prompt, system_message="Return JSON array of bullet objects.", model=chosen_provider)
-        if not result:
-            raise MatchOptimizerError("Empty API response")
-        optimized = json.loads(result)
-        if not isinstance(optimized, list):
-            raise MatchOptimizerError("Invalid response format")
-        for bullet in optimized:
-            bullet["bolded_overview"] = refine_section(bullet.get("bolded_overview", ""), "bullet_overview")
-            bullet["description"] = refine_section(bullet.get("description", ""), "bullet_description")
+        parts = []
+        parts_append = parts.append
+        for b in bullets:
+            parts_append(_BULLET_FMT(b["bolded_overview"], b["description"]))
+        bullet_text = "\n".join(parts)
+        prompt = _BULLETS_PROMPT(job_description=job_description, bullet_text=bullet_text)
+
+        def compute() -> List[Dict[str, str]]:
+            result = call_api(prompt=prompt, system_message="Return JSON array of bullet objects.", model=choose_provider(), temperature=CONFIG["OPTIMIZER_TEMPERATURE"])
+            if not result:
+                raise MatchOptimizerError("Empty API response")
+            optimized = _parse_llm_json(result, list)
+            if not isinstance(optimized, list):
+                raise MatchOptimizerError("Invalid response format")
+            return optimized
+        # Refinement samples its own LLM calls, so it runs on the (possibly cached) answer, uncached.
+        optimized = _cached_result("optimize_bullets", prompt, compute)
+        # Each refinement is independent, so run them concurrently.
+        with ThreadPoolExecutor(max_workers=max(1, min(16, 2 * len(optimized)))) as executor:
+            futures = [
+                (
+                    bullet,
+                    executor.submit(refine_section, bullet.get("bolded_overview", ""), "bullet_overview"),
+                    executor.submit(refine_section, bullet.get("description", ""), "bullet_description")
+                )
+                for bullet in optimized
+            ]
+            for bullet, overview_future, description_future in futures:
+                bullet["bolded_overview"] = overview_future.result()
+                bullet["description"] = description_future.result()
         return optimized
     except Exception as e:
         raise MatchOptimizerError(f"Failed to optimize bullets: {e}")
 
+def _bullets_json(bullets: List[Dict[str, str]]) -> str:
+    """
+    Serializes bullets as indented JSON for the evaluation prompt (orjson when installed).
+    """
+    if orjson is not None:
+        return orjson.dumps(bullets, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(bullets, indent=2)
+
 def evaluate_match(optimized_content: Dict[str, Any], job_description: str) -> Dict[str, Any]:
     """
     Evaluates the match between the optimized resume content and the job description.
     Returns a JSON object with keys 'match_rating' and 'explanation'.
     """
     try:
-        content_text = f"""Objective:
-{optimized_content['objective']}
-
-Skills:
-{optimized_content['skills']}
-
-Experience:
-{json.dumps(optimized_content['bullets'], indent=2)}"""
-        prompt = f"""Evaluate the match between this resume and the job:
-
-Job Description:
-{job_description}
-
-Resume Content:
-{content_text}
+        prompt = _EVALUATION_PROMPT(
+            job_description=job_description,
+            objective=optimized_content["objective"],
+            skills=optimized_content["skills"],
+            bullets=_bullets_json(optimized_content["bullets"])
+        )
 
-Return JSON with:
-- match_rating (0-100)
-- explanation (detailed analysis)"""
-        providers = CONFIG["LLM_PROVIDER_LIST"].split(",")
-        chosen_provider = random.choice(providers).strip()
-        result = call_api(prompt=prompt, system_message="Return JSON with match_rating and explanation.", model=chosen_provider)
-        if not result:
-            raise MatchOptimizerError("Empty API response")
-        evaluation = json.loads(result)
-        if not isinstance(evaluation, dict):
-            raise MatchOptimizerError("Invalid response format")
-        for key in ["match_rating", "explanation"]:
-            if key not in evaluation:
-                raise MatchOptimizerError(f"Missing field: {key}")
-        return evaluation
+        def compute() -> Dict[str, Any]:
+            result = call_api(prompt=prompt, system_message="Return JSON with match_rating and explanation.", model=choose_provider(), temperature=CONFIG["OPTIMIZER_TEMPERATURE"])
+            if not result:
+                raise MatchOptimizerError("Empty API response")
+            evaluation = _parse_llm_json(result, dict)
+            if not isinstance(evaluation, dict):
+                raise MatchOptimizerError("Invalid response format")
+            if "match_rating" not in evaluation:
+                raise MatchOptimizerError("Missing field: match_rating")
+            if "explanation" not in evaluation:
+                raise MatchOptimizerError("Missing field: explanation")
+            return evaluation
+        return _cached_result("evaluate_match", prompt, compute)
     except Exception as e:
         raise MatchOptimizerError(f"Failed to evaluate match: {e}")
 
-def optimize_match(job_data: JobData) -> Optional[Dict[str, Any]]:
+def load_resume_corpus() -> ResumeCorpus:
+    """
+    Loads every resume record and, for similarity selection, vectorizes them.
+    Neither depends on the job, so pipelines build the corpus once and share it.
+    """
+    # Placeholder: load resume data from database or file (omitted for brevity)
+    all_resumes = []  # Replace with actual resume data list
+    if not all_resumes:
+        raise MatchOptimizerError("No resume data available for optimization")
+    vectors = resume_vectors(all_resumes) if CONFIG["RESUME_SELECTION"] == "similarity" else None
+    return ResumeCorpus(resumes=all_resumes, vectors=vectors)
+
+def load_resume_aggregates(job_description: Optional[str] = None, corpus: Optional[ResumeCorpus] = None) -> ResumeAggregates:
+    """
+    Aggregates the top resumes' objectives, skills, and bullets from corpus (loaded if not given).
+    Without a job_description the result does not depend on the job, so pipelines build it
+    once and share it; with one (similarity selection) only the ranking is redone per job.
+    """
+    if corpus is None:
+        corpus = load_resume_corpus()
+    top_resumes = select_top_resumes(corpus.resumes, job_description=job_description, vectors=corpus.vectors)
+    if not top_resumes:
+        raise MatchOptimizerError("No resume is similar enough to the job")
+    return ResumeAggregates(
+        objectives=[r.get("objective", "") for r in top_resumes],
+        skills=dedupe_skills(chain.from_iterable(r.get("skills_list", ()) for r in top_resumes)),
+        bullets=list(chain.from_iterable(
+            j.get("bullets", ()) for r in top_resumes for j in r.get("jobs_section", ())
+        ))
+    )
+
+def optimize_match(job_data: JobData, resume_aggregates: Optional[ResumeAggregates] = None, resume_corpus: Optional[ResumeCorpus] = None) -> Optional[Dict[str, Any]]:
     """
     Coordinates the optimization process for a given job:
-    - Aggregates resume data (placeholder list used here).
-    - Optimizes objective, skills, and bullet points.
+    - Uses the precomputed resume_aggregates (or builds them for this job via load_resume_aggregates,
+      from the shared resume_corpus when given).
+    - Optimizes objective, skills, and bullet points (concurrently).
     - Evaluates the overall match.
     - Logs the optimization status.
     
     Returns a dictionary containing optimized content and match evaluation.
     """
     try:
-        # Placeholder: load resume data from database or file (omitted for brevity)
-        all_resumes = []  # Replace with actual resume data list
-        if not all_resumes:
-            raise MatchOptimizerError("No resume data available for optimization")
-        top_resumes = select_top_resumes(all_resumes)
-        objectives = [r.get("objective", "") for r in top_resumes]
-        skills = [s for r in top_resumes for s in r.get("skills_list", [])]
-        bullets = [b for r in top_resumes for j in r.get("jobs_section", []) for b in j.get("bullets", [])]
+        if resume_aggregates is None:
+            resume_aggregates = load_resume_aggregates(job_data.cleaned_description, resume_corpus)
+        objectives = resume_aggregates.objectives
+        skills = resume_aggregates.skills
+        bullets = resume_aggregates.bullets
         
-        optimized = {
-            "objective": optimize_objective(objectives, job_data.cleaned_description),
-            "skills": optimize_skills(skills, job_data.cleaned_description),
-            "bullets": optimize_bullets(bullets, job_data.cleaned_description)
-        }
+        # The three sections depend only on the job description, so their LLM calls run concurrently.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            objective_future = executor.submit(optimize_objective, objectives, job_data.cleaned_description)
+            skills_future = executor.submit(optimize_skills, skills, job_data.cleaned_description)
+            bullets_future = executor.submit(optimize_bullets, bullets, job_data.cleaned_description)
+            optimized = {
+                "objective": objective_future.result(),
+                "skills": skills_future.result(),
+                "bullets": bullets_future.result()
+            }
         evaluation = evaluate_match(optimized, job_data.cleaned_description)
         log_process(f"Optimized match for job {job_data.jid} with rating {evaluation.get('match_rating', 0)}%", "INFO", module="MatchOptimizer")
         return {
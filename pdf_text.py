@@ -0,0 +1,106 @@
+# pdf_text.py
+# v1.0.0
+# 2-27-25
+
+'''
+Plan:
+
+    Extract plain text from PDF files with PyMuPDF.
+    Pick the execution strategy from a page-count tier table: serial for small documents,
+    page-range tasks on worker processes for medium and large ones.
+    Share one process pool for the whole run, started with forkserver (or spawn), never fork:
+    callers run on worker threads, and forking a threaded process can deadlock the child.
+'''
+
+"""
+PDF Text Module
+
+This module extracts text from PDF files:
+- PDF_EXTRACTION_TIERS maps page counts to a strategy (tune it there).
+- Small PDFs are read page by page in the calling process.
+- Larger PDFs are split into page-range tasks; each task is decoded by a worker process
+  that opens its own fitz.Document (PyMuPDF documents are neither thread-safe nor picklable).
+- Worker processes come from one shared pool (get_pdf_pool) using a forkserver or spawn
+  context; workers re-import the main script's modules, so those must have no import-time side effects.
+- Page texts are joined with newlines in page order.
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+# Execution strategy by document size, checked in order (max_pages None = no upper bound).
+# "serial" decodes in the calling process; "process" splits the document into tasks of
+# pages_per_task pages decoded by the shared worker pool.
+PDF_EXTRACTION_TIERS = [
+    {"max_pages": 10, "strategy": "serial"},
+    {"max_pages": 200, "strategy": "process", "pages_per_task": 25},
+    {"max_pages": None, "strategy": "process", "pages_per_task": 200},
+]
+
+# Size of the shared PDF worker pool.
+MAX_PDF_WORKERS = min(8, os.cpu_count() or 1)
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process-wide PDF worker pool, creating it on first use.
+    Uses a forkserver context where available (spawn elsewhere), so workers are never forked
+    from a process that already has threads running.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _POOL = ProcessPoolExecutor(max_workers=MAX_PDF_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _POOL
+
+def _page_range_text(path: str, start: int, stop: int, flags: Optional[int]) -> List[str]:
+    """
+    Returns the text of pages [start, stop) of the PDF at path (runs in a worker process).
+    """
+    with fitz.open(path) as doc:
+        return [_page_text(doc[number], flags) for number in range(start, stop)]
+
+def _page_text(page: "fitz.Page", flags: Optional[int]) -> str:
+    """
+    Returns one page's plain text, with explicit extraction flags if given.
+    """
+    if flags is None:
+        return page.get_text("text")
+    return page.get_text("text", flags=flags)
+
+def select_tier(page_count: int) -> Dict[str, Any]:
+    """
+    Returns the PDF_EXTRACTION_TIERS entry for a document of page_count pages.
+    """
+    for tier in PDF_EXTRACTION_TIERS:
+        if tier["max_pages"] is None or page_count <= tier["max_pages"]:
+            return tier
+    return PDF_EXTRACTION_TIERS[-1]
+
+def extract_pdf_text(path: str, flags: Optional[int] = None) -> str:
+    """
+    Extracts the text of every page of a PDF, joined with newlines.
+    The execution strategy (serial or worker processes) is chosen by page count via select_tier.
+    """
+    path = str(path)
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+        tier = select_tier(page_count)
+        if tier["strategy"] == "serial" or MAX_PDF_WORKERS < 2:
+            return "\n".join(_page_text(page, flags) for page in doc)
+
+    step = tier["pages_per_task"]
+    ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    executor = get_pdf_pool()
+    futures = [executor.submit(_page_range_text, path, start, stop, flags) for start, stop in ranges]
+    return "\n".join(text for future in futures for text in future.result())
+
+# End of pdf_text.py
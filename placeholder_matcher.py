@@ -30,7 +30,7 @@ from typing import Dict, List, Tuple, Optional, Pattern
 from dataclasses import dataclass
 from functools import lru_cache
 
-from logging_manager import log_process
+from logging_manager import log_process, log_debug_lazy
 
 # Type alias for a dictionary mapping skill numbers to placeholders.
 PlaceholderDict = Dict[int, str]
@@ -63,6 +63,10 @@ class PlaceholderMatcher:
     SKILL_PATTERN: Pattern = re.compile(r"<SKILL\s*(\d+)>")
     OVERVIEW_PATTERN: Pattern = re.compile(r"<OverView>")
     BULLET_PATTERN: Pattern = re.compile(r"<Experience-Bullet(\d+)-(BoldedOverview|Description)-J(\d+)>")
+    # All three placeholder kinds in one alternation, so validate_template scans the text once.
+    COMBINED_PATTERN: Pattern = re.compile(
+        r"<SKILL\s*(?P<skill>\d+)>|(?P<overview><OverView>)|(?P<bullet><Experience-Bullet\d+-(?:BoldedOverview|Description)-J\d+>)"
+    )
     
     @classmethod
     def validate_text(cls, text: str) -> None:
@@ -79,17 +83,11 @@ class PlaceholderMatcher:
         """
         Extracts skill placeholders from the provided text.
         Returns a dictionary mapping skill numbers to the placeholder text.
+        The scan itself is memoized per text (see _scan_skill_placeholders).
         """
         cls.validate_text(text)
-        placeholders: PlaceholderDict = {}
-        for match in cls.SKILL_PATTERN.finditer(text):
-            try:
-                num = int(match.group(1))
-                if 1 <= num <= 10:
-                    placeholders[num] = match.group(0)
-            except ValueError:
-                continue
-        log_process(f"Extracted {len(placeholders)} skill placeholders", "DEBUG", module="PlaceholderMatcher")
+        placeholders: PlaceholderDict = dict(_scan_skill_placeholders(text))
+        log_debug_lazy(lambda: f"Extracted {len(placeholders)} skill placeholders", module="PlaceholderMatcher")
         return placeholders
     
     @classmethod
@@ -99,18 +97,19 @@ class PlaceholderMatcher:
         Returns a list of tuples containing paired placeholders and skill texts.
         """
         try:
-            skills_list = [
-                (num, skills_texts.get(num, ""), skills_dict[num])
-                for num in sorted(skills_dict.keys())
+            # Placeholders and texts in placeholder order (extract_skill_placeholders yields
+            # ascending numbers). Lengths are computed once and argsorted longest-first with a
+            # C-level key (no per-element lambda); then pair longest with shortest.
+            placeholders = list(skills_dict.values())
+            texts = [skills_texts.get(num, "") for num in skills_dict]
+            lens = list(map(len, texts))
+            n = len(lens)
+            order = sorted(range(n), key=lens.__getitem__, reverse=True)
+            pairs: List[SkillPair] = [
+                (placeholders[hi], texts[hi], placeholders[lo], texts[lo])
+                for hi, lo in zip(order[:n // 2], reversed(order[n - n // 2:]))
             ]
-            sorted_skills = sorted(skills_list, key=lambda x: len(x[1]), reverse=True)
-            pairs: List[SkillPair] = []
-            n = len(sorted_skills)
-            for i in range(n // 2):
-                first = sorted_skills[i]
-                last = sorted_skills[n - 1 - i]
-                pairs.append((first[2], first[1], last[2], last[1]))
-            log_process(f"Created {len(pairs)} skill pairs", "DEBUG", module="PlaceholderMatcher")
+            log_debug_lazy(lambda: f"Created {len(pairs)} skill pairs", module="PlaceholderMatcher")
             return pairs
         except Exception as e:
             raise PlaceholderError(f"Failed to pair skills: {e}")
@@ -135,21 +134,46 @@ class PlaceholderMatcher:
     def validate_template(cls, template_text: str) -> bool:
         """
         Validates that the resume template contains all required placeholders.
+        The overview, skill, and bullet placeholders are collected in a single COMBINED_PATTERN scan.
         Returns True if valid; otherwise, logs the error and returns False.
         """
         try:
             cls.validate_text(template_text)
-            if not cls.OVERVIEW_PATTERN.search(template_text):
+            skill_numbers = set()
+            has_overview = False
+            bullet_count = 0
+            for match in cls.COMBINED_PATTERN.finditer(template_text):
+                kind = match.lastgroup
+                if kind == "skill":
+                    num = int(match.group("skill"))
+                    if 1 <= num <= 10:
+                        skill_numbers.add(num)
+                elif kind == "overview":
+                    has_overview = True
+                else:
+                    bullet_count += 1
+            if not has_overview:
                 raise PlaceholderError("Missing overview placeholder")
-            skill_placeholders = cls.extract_skill_placeholders(template_text)
-            if len(skill_placeholders) != 10:
-                raise PlaceholderError(f"Expected 10 skill placeholders, found {len(skill_placeholders)}")
-            bullet_matches = list(cls.BULLET_PATTERN.finditer(template_text))
-            if not bullet_matches:
+            if len(skill_numbers) != 10:
+                raise PlaceholderError(f"Expected 10 skill placeholders, found {len(skill_numbers)}")
+            if not bullet_count:
                 raise PlaceholderError("Missing bullet point placeholders")
             return True
         except Exception as e:
             log_process(f"Template validation failed: {e}", "ERROR", module="PlaceholderMatcher")
             return False
 
+@lru_cache(maxsize=32)
+def _scan_skill_placeholders(text: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Returns ((number, placeholder), ...) for the <SKILL N> placeholders (1-10) in text.
+    Cached as an immutable tuple, so repeated templates are scanned once.
+    """
+    placeholders: PlaceholderDict = {}
+    for match in PlaceholderMatcher.SKILL_PATTERN.finditer(text):
+        num = int(match.group(1))
+        if 1 <= num <= 10:
+            placeholders[num] = match.group(0)
+    return tuple(sorted(placeholders.items()))
+
 # End of placeholder_matcher.py
@@ -0,0 +1,183 @@
+# response_cache.py
+# v1.0.0
+# 2-27-25
+
+'''
+Plan:
+
+    Persist LLM responses in a local SQLite table keyed by a hash of (model, temperature, system message, prompt).
+    Expire entries after RESPONSE_CACHE_TTL seconds.
+    Expose a process-wide cache instance for api_interface.call_api / acall_api.
+    Also store callers' validated results (JSON) under namespaced keys.
+'''
+
+"""
+Response Cache Module
+
+This module provides a small persistent cache for LLM responses:
+- Keys are SHA-256 digests of the model, temperature, system message, and whitespace-normalized prompt.
+- Callers decide what is stored: api_interface.call_api only caches temperature-0 completions
+  that pass the caller's cache_if validation.
+- Entries live in a SQLite file (RESPONSE_CACHE_PATH) and expire after RESPONSE_CACHE_TTL seconds.
+- Hit/miss counters are kept per process and emitted as an advanced metric at exit.
+- get_cached_result / set_cached_result store already-validated results (e.g. optimized
+  resume sections) as JSON under namespaced keys in the same table.
+- The cache is disabled entirely when RESPONSE_CACHE_ENABLED is false (the default).
+"""
+
+import re
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config_manager import CONFIG
+from logging_manager import log_process, log_advanced_metric
+
+# Collapses any run of whitespace so formatting-only prompt differences share a key.
+_WHITESPACE_RE = re.compile(r"\s+")
+
+class ResponseCacheError(Exception):
+    """Custom exception for response cache errors."""
+    pass
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalizes a prompt for cache keying (collapses whitespace, strips the ends).
+    """
+    return _WHITESPACE_RE.sub(" ", prompt).strip()
+
+def make_cache_key(model: str, system_message: Optional[str], prompt: str, json_mode: bool = False, temperature: Optional[float] = None) -> str:
+    """
+    Returns the SHA-256 hex digest identifying a request.
+    """
+    parts = (model, f"t={temperature}", system_message or "", normalize_prompt(prompt), "json" if json_mode else "text")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def make_result_key(namespace: str, *parts: str) -> str:
+    """
+    Returns the SHA-256 hex digest identifying a validated result (namespace + its inputs).
+    """
+    return hashlib.sha256("\x1f".join((namespace, *parts)).encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with a TTL.
+    A single connection is shared across threads and serialized with a lock.
+    """
+    def __init__(self, path: Path, ttl: int):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise ResponseCacheError(f"Failed to open response cache at {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached content for key, or None if missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT content, ts FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[1] < self.ttl:
+                self.stats["hits"] += 1
+                return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, key: str, content: str) -> None:
+        """
+        Stores content under key, replacing any previous entry.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, ts) VALUES (?, ?, ?)",
+                (key, content, time.time())
+            )
+            self._conn.commit()
+
+    def log_stats(self) -> None:
+        """
+        Emits the hit/miss counters for this process as an advanced metric.
+        """
+        with self._lock:
+            hits, misses = self.stats["hits"], self.stats["misses"]
+        lookups = hits + misses
+        if lookups:
+            log_advanced_metric({
+                "type": "response_cache",
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / lookups, 4)
+            })
+
+    def prune(self) -> int:
+        """
+        Deletes expired entries. Returns the number of rows removed.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE ts < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+            return cursor.rowcount
+
+_CACHE: Optional[ResponseCache] = None
+_CACHE_INIT_LOCK = threading.Lock()
+_CACHE_DISABLED = False
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide ResponseCache, or None when caching is disabled or unavailable.
+    """
+    global _CACHE, _CACHE_DISABLED
+    if _CACHE is not None or _CACHE_DISABLED:
+        return _CACHE
+    with _CACHE_INIT_LOCK:
+        if _CACHE is None and not _CACHE_DISABLED:
+            if not CONFIG["RESPONSE_CACHE_ENABLED"]:
+                _CACHE_DISABLED = True
+            else:
+                try:
+                    _CACHE = ResponseCache(CONFIG["RESPONSE_CACHE_PATH"], CONFIG["RESPONSE_CACHE_TTL"])
+                    atexit.register(_CACHE.log_stats)
+                    pruned = _CACHE.prune()
+                    log_process(f"Response cache: pruned {pruned} expired entries", "DEBUG", module="ResponseCache")
+                except ResponseCacheError as e:
+                    log_process(f"{e}; continuing without a response cache", "WARNING", module="ResponseCache")
+                    _CACHE_DISABLED = True
+    return _CACHE
+
+def get_cached_result(key: str) -> Optional[Any]:
+    """
+    Returns the JSON-decoded result stored under key, or None (miss, expired, or cache disabled).
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    content = cache.get(key)
+    if content is None:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+def set_cached_result(key: str, value: Any) -> None:
+    """
+    Stores a validated, JSON-serializable result under key (no-op when the cache is disabled).
+    """
+    cache = get_response_cache()
+    if cache is not None:
+        cache.set(key, json.dumps(value))
+
+# End of response_cache.py
@@ -10,24 +10,39 @@ This module assembles the final resume by injecting optimized content into a DOC
 Flow:
 1. Load the DOCX template from STATIC_DATA.
 2. Validate and parse optimized content into an OptimizedContent data structure.
-3. Extract placeholders from the template.
-4. Replace placeholders with the optimized objective, skills, and bullet points.
-5. Save the final resume and log its details.
+3. Replace placeholders with the optimized objective, skills, and bullet points.
+4. Save the final resume and log its details.
 """
 
+import io
 import os
+import re
 import json
 import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import ClassVar, Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
 from docx import Document
+from docx.oxml.ns import qn
 from logging_manager import log_process
-from placeholder_matcher import PlaceholderMatcher
 from config_manager import CONFIG
 from helpers import safe_file_write
 
+# Cheap prefilter for text nodes that can contain a resume placeholder.
+_PLACEHOLDER_PROBE = re.compile(r"<(?:OverView|SKILL |Experience-Bullet)")
+
+# Clark-notation tag of WordprocessingML text nodes, walked directly by inject_content.
+_W_T = qn("w:t")
+_XML_SPACE = qn("xml:space")
+
+# Single-pass sanitizer for company/title path segments: drops spaces and path-hostile characters.
+_DIR_SANITIZE = str.maketrans({" ": "", "/": "-", "\\": "-", ":": "", ",": "", "&": "and"})
+
+# Job metadata fields every build needs (output directory name and analytics log).
+_REQUIRED_JOB_FIELDS = ("jid", "Company Name", "Title")
+
 @dataclass
 class OptimizedContent:
     """
@@ -44,6 +59,8 @@ class OptimizedContent:
     bullets: List[Dict[str, str]]
     match_rating: float
     job_data: Dict[str, str]
+    # The template's skill placeholders are fixed, so they are not scanned from the document.
+    SKILL_KEYS: ClassVar[Tuple[str, ...]] = tuple(f"<SKILL {i}>" for i in range(1, 11))
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'OptimizedContent':
@@ -62,10 +79,9 @@ class OptimizedContent:
         """
         if not self.objective:
             raise ValueError("Missing objective statement")
-        if len(self.skills) != 10:
-            raise ValueError(f"Expected 10 skills, got {len(self.skills)}")
-        required_fields = ['jid', 'Company Name', 'Title']
-        missing = [field for field in required_fields if not self.job_data.get(field)]
+        if len(self.skills) != len(self.SKILL_KEYS):
+            raise ValueError(f"Expected {len(self.SKILL_KEYS)} skills, got {len(self.skills)}")
+        missing = [field for field in _REQUIRED_JOB_FIELDS if not self.job_data.get(field)]
         if missing:
             raise ValueError(f"Missing required job fields: {', '.join(missing)}")
 
@@ -82,6 +98,14 @@ def get_template_path() -> Path:
         raise ResumeBuilderError(f"Template not found at {template_path}")
     return template_path
 
+@lru_cache(maxsize=1)
+def _template_bytes() -> bytes:
+    """
+    Returns the raw bytes of the resume template, read from disk once per run.
+    Each build parses its own Document from a fresh BytesIO over these bytes.
+    """
+    return get_template_path().read_bytes()
+
 def create_output_directory(job_data: Dict[str, str], base_dir: Optional[str] = None) -> Path:
     """
     Creates an output directory based on the job's metadata.
@@ -90,8 +114,8 @@ def create_output_directory(job_data: Dict[str, str], base_dir: Optional[str] =
         base_dir = CONFIG.get("FINISHED_JOB_RESUME_DIR", "FINISHED_JOB_RESUME")
     try:
         today = datetime.datetime.now().strftime("%Y%m%d")
-        company = job_data.get("Company Name", "Unknown").replace(" ", "")
-        title = job_data.get("Title", "Unknown").replace(" ", "")
+        company = job_data.get("Company Name", "Unknown").translate(_DIR_SANITIZE)
+        title = job_data.get("Title", "Unknown").translate(_DIR_SANITIZE)
         jid = job_data.get("jid", "Unknown")
         output_dir = Path(base_dir) / f"{today}_{company}_{title}_{jid}"
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -99,47 +123,47 @@ def create_output_directory(job_data: Dict[str, str], base_dir: Optional[str] =
     except Exception as e:
         raise ResumeBuilderError(f"Failed to create output directory: {e}")
 
-def replace_placeholder_text(paragraph: Any, placeholder: str, new_text: str, preserve_formatting: bool = True) -> None:
+def build_placeholder_mapping(content: OptimizedContent) -> Dict[str, str]:
+    """
+    Builds the placeholder -> replacement text mapping for the optimized content.
+    Covers <OverView>, <SKILL N>, and the J1 bullet overview/description placeholders.
+    """
+    mapping = {"<OverView>": content.objective}
+    mapping.update(zip(OptimizedContent.SKILL_KEYS, content.skills))
+    for i, bullet in enumerate(content.bullets, 1):
+        mapping[f"<Experience-Bullet{i}-BoldedOverview-J1>"] = bullet.get("bolded_overview", "")
+        mapping[f"<Experience-Bullet{i}-J1>"] = bullet.get("description", "")
+    return mapping
+
+@lru_cache(maxsize=32)
+def _placeholder_pattern(keys: Tuple[str, ...]) -> re.Pattern:
     """
-    Replaces the placeholder text within a paragraph.
-    If preserve_formatting is True, it replaces text in each run.
+    Returns the compiled alternation of the given placeholders, longest first.
+    The key set only varies with the bullet count, so each pattern is compiled once per run.
     """
-    if not preserve_formatting:
-        paragraph.text = paragraph.text.replace(placeholder, new_text)
-        return
-    for run in paragraph.runs:
-        if placeholder in run.text:
-            run.text = run.text.replace(placeholder, new_text)
+    return re.compile("|".join(re.escape(key) for key in sorted(keys, key=len, reverse=True)))
 
-def inject_content(doc: Document, content: OptimizedContent, skill_placeholders: List[str]) -> None:
+def inject_content(doc: Document, content: OptimizedContent, skill_placeholders: Optional[List[str]] = None) -> None:
     """
     Injects optimized content into the document by replacing placeholders.
     
     Flow:
-    - Replace <OverView> with the objective.
-    - For each skill placeholder (<SKILL N>), replace with the corresponding skill.
-    - Replace bullet placeholders with bullet text.
+    - Build a single placeholder -> text mapping (overview, skills, bullets).
+    - Walk the body's <w:t> text nodes once with lxml (paragraphs and table cells alike),
+      and substitute every placeholder in nodes that pass the placeholder probe with one
+      alternation regex (compiled once per placeholder set, see _placeholder_pattern).
+    skill_placeholders is accepted for backward compatibility and is not used; the skill
+    placeholders are the static OptimizedContent.SKILL_KEYS.
     """
     try:
-        # Replace overview placeholder.
-        for para in doc.paragraphs:
-            if "<OverView>" in para.text:
-                replace_placeholder_text(para, "<OverView>", content.objective)
-        # Replace skill placeholders.
-        for i, skill in enumerate(content.skills, 1):
-            placeholder = f"<SKILL {i}>"
-            for para in doc.paragraphs:
-                if placeholder in para.text:
-                    replace_placeholder_text(para, placeholder, skill)
-        # Replace bullet placeholders.
-        for i, bullet in enumerate(content.bullets, 1):
-            overview_placeholder = f"<Experience-Bullet{i}-BoldedOverview-J1>"
-            detail_placeholder = f"<Experience-Bullet{i}-J1>"
-            for para in doc.paragraphs:
-                if overview_placeholder in para.text:
-                    replace_placeholder_text(para, overview_placeholder, bullet.get("bolded_overview", ""))
-                if detail_placeholder in para.text:
-                    replace_placeholder_text(para, detail_placeholder, bullet.get("description", ""))
+        mapping = build_placeholder_mapping(content)
+        pattern = _placeholder_pattern(tuple(mapping))
+        for text_node in doc.element.body.iter(_W_T):
+            text = text_node.text
+            # A plain "<" membership test rejects most nodes before any regex runs.
+            if text and "<" in text and _PLACEHOLDER_PROBE.search(text):
+                text_node.text = pattern.sub(lambda match: mapping[match.group(0)], text)
+                text_node.set(_XML_SPACE, "preserve")
     except Exception as e:
         raise ResumeBuilderError(f"Failed to inject content: {e}")
 
@@ -163,22 +187,18 @@ def build_final_resume(optimized_data: Dict[str, Any], output_dir: Optional[str]
     
     Steps:
     1. Convert optimized_data to an OptimizedContent instance and validate it.
-    2. Load the DOCX template.
-    3. Extract skill placeholders from the document.
-    4. Inject optimized content into the template.
-    5. Save the final document and log its details.
+    2. Load the DOCX template (bytes cached in memory after the first build).
+    3. Inject optimized content into the template.
+    4. Save the final document and log its details.
     """
     try:
         content = OptimizedContent.from_dict(optimized_data)
         content.validate()
-        template_path = get_template_path()
+        template_bytes = _template_bytes()
         out_dir = create_output_directory(content.job_data, output_dir)
         output_path = out_dir / "final_resume.docx"
-        doc = Document(template_path)
-        # Extract skill placeholders from the document text.
-        all_text = "\n".join([p.text for p in doc.paragraphs])
-        skill_placeholders = list(PlaceholderMatcher.extract_skill_placeholders(all_text).values())
-        inject_content(doc, content, skill_placeholders)
+        doc = Document(io.BytesIO(template_bytes))
+        inject_content(doc, content)
         doc.save(output_path)
         log_process(f"Final resume saved at {output_path}", "INFO", module="ResumeBuilder")
         log_resume_details(content, output_path)
@@ -4,7 +4,7 @@
 
 """
 # Next Steps and Changes to be Made
-1) Integrate real data ingestion calls in `process_resume_files()` if needed (like scanning a directory).
+1) Integrate real data ingestion calls in `process_resume_files()` if needed (directories are scanned by `process_resume_directory()`).
 2) Decide how you'd like these extracted resume JSON files to be stored or queried (currently saved in `EXTRACTED_DATA/resume_data/`).
 3) Ensure that `match_optimizer.py` (or another pipeline step) actually loads this extracted data to do real “aggregated resume” logic.
 
@@ -29,27 +29,66 @@
 """
 
 import os
+import re
+import asyncio
 import json
 import datetime
 import shutil
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
 import fitz  # For PDF extraction (PyMuPDF) - if needed
 from docx import Document
+from lxml import etree  # installed with python-docx
 from bs4 import BeautifulSoup
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser.
+    orjson = None
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; fall back to BeautifulSoup with lxml.
+    HTMLParser = None
+
 from logging_manager import log_process, log_advanced_metric
 from config_manager import CONFIG
-from api_interface import call_api
-from helpers import partial_json_salvage
-from helpers import validate_file_path, safe_file_write
+from api_interface import call_api, acall_api
+from helpers import validate_file_path, safe_file_write, sequential_id, docx_text, cached_file_text, loads_or_salvage
+from response_cache import make_result_key, get_cached_result, set_cached_result
+from pdf_text import extract_pdf_text
 
 class ResumeExtractionError(Exception):
     """Custom exception for resume extraction errors."""
     pass
 
+# PyMuPDF text flags: keep whitespace and clip to the page, but skip ligature
+# preservation (ligatures are expanded into plain characters for the LLM).
+_PDF_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# Name of the index file (kept alongside the RES-*.json records) listing processed source files.
+PROCESSED_INDEX_NAME = "_processed_index.json"
+
+# In-memory copy of the processed index; loaded once per run by _load_processed_index().
+_PROCESSED_CACHE: Optional[Set[str]] = None
+
+# Serializes record writes and processed-index access across worker threads.
+_INDEX_LOCK = threading.RLock()
+
+# Sampling temperature of the extraction call: extraction is deterministic (as for jobs), which also
+# makes its validated results safe to reuse from the result cache.
+_EXTRACTION_TEMPERATURE = 0
+
+# Cheap pre-LLM sanity check: a real resume has some length and at least a couple of dated entries.
+_MIN_RESUME_CHARS = 200
+_MIN_YEAR_MENTIONS = 2
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
 @dataclass
 class ResumeData:
     """
@@ -105,36 +144,66 @@ def extract_text_from_file(file_path: Path) -> Optional[str]:
     """
     Extracts text from a file based on its extension.
     Supports: TXT, PDF, DOCX, and HTML.
+    Results are cached in memory and on disk by helpers.cached_file_text.
     """
-    file_path = validate_file_path(file_path, must_exist=True)
     try:
-        suffix = file_path.suffix.lower()
-        if suffix == ".txt":
-            return file_path.read_text(encoding="utf-8")
-        elif suffix == ".pdf":
-            text_chunks = []
-            with fitz.open(str(file_path)) as pdf_doc:
-                for page in pdf_doc:
-                    text_chunks.append(page.get_text("text"))
-            return "\n".join(text_chunks)
-        elif suffix == ".docx":
-            doc = Document(file_path)
-            return "\n".join(para.text for para in doc.paragraphs)
-        elif suffix == ".html":
-            html = file_path.read_text(encoding="utf-8")
-            soup = BeautifulSoup(html, "html.parser")
-            return soup.get_text(separator="\n")
-        else:
-            raise ResumeExtractionError(f"Unsupported file type: {suffix}")
+        file_path = validate_file_path(file_path, must_exist=True)
+        return cached_file_text(file_path, _read_text, "resume")
     except Exception as e:
-        log_process(f"Error reading {file_path.name}: {e}", "ERROR", module="ResumeExtractor")
+        log_process(f"Error reading {Path(file_path).name}: {e}", "ERROR", module="ResumeExtractor")
         return None
 
+def _read_txt(file_path: Path) -> str:
+    return file_path.read_text(encoding="utf-8")
+
+def _read_pdf(file_path: Path) -> str:
+    # Strategy (serial or worker processes) is picked by page count in pdf_text.
+    return extract_pdf_text(str(file_path), flags=_PDF_TEXT_FLAGS)
+
+def _read_docx(file_path: Path) -> str:
+    # Stream paragraph text straight from word/document.xml; python-docx is only loaded
+    # if the document part cannot be parsed directly.
+    try:
+        return docx_text(file_path)
+    except (KeyError, OSError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        pass  # Not a plain WordprocessingML package; let python-docx handle it.
+    return "\n".join(para.text for para in Document(file_path).paragraphs)
+
+def _read_html(file_path: Path) -> str:
+    html = file_path.read_text(encoding="utf-8")
+    if HTMLParser is not None:
+        # selectolax (lexbor) parses and walks the tree in C, without BeautifulSoup's Python objects.
+        return HTMLParser(html).text(separator="\n")
+    # lxml (already required by python-docx) is a C parser, much faster than "html.parser".
+    soup = BeautifulSoup(html, "lxml")
+    return soup.get_text(separator="\n")
+
+# Text reader per (lowercased) file suffix; register new resume formats here.
+_READERS: Dict[str, Callable[[Path], str]] = {
+    ".txt": _read_txt,
+    ".pdf": _read_pdf,
+    ".docx": _read_docx,
+    ".html": _read_html,
+}
+
+# Resume file types picked up when process_resume_files is given a directory.
+RESUME_SUFFIXES = tuple(_READERS)
+
+def _read_text(file_path: Path) -> str:
+    """
+    Reads the text of a resume file with the reader for its extension;
+    raises on unsupported or unreadable files.
+    """
+    reader = _READERS.get(file_path.suffix.lower())
+    if reader is None:
+        raise ResumeExtractionError(f"Unsupported file type: {file_path.suffix.lower()}")
+    return reader(file_path)
+
 def _clean_api_response(response: Any) -> Dict[str, Any]:
     """
     Cleans the LLM API response and extracts the required fields.
     Enforces the JSON structure defined in the `resume_extraction_strict_prompt`.
-    Uses partial JSON salvage if enabled.
+    Parses via helpers.loads_or_salvage (partial JSON salvage if enabled).
     Returns a dictionary (possibly partially filled if salvage used).
     """
     default_struct = {
@@ -153,23 +222,16 @@ def _clean_api_response(response: Any) -> Dict[str, Any]:
         response = response.content
 
     if isinstance(response, str):
-        # Attempt to isolate the JSON portion
-        start_idx = response.find('{')
-        end_idx = response.rfind('}')
-        if start_idx != -1 and end_idx != -1:
-            response = response[start_idx:end_idx+1].strip()
-        # Convert single quotes to double if needed
-        response = response.replace("'", "\"")
-
         try:
-            parsed = json.loads(response)
-        except json.JSONDecodeError as e:
-            log_process(f"JSON parsing failed: {e}", "DEBUG", module="ResumeExtractor")
-            if CONFIG.get("ALLOW_PARTIAL_JSON_PARSE", False):
-                parsed = partial_json_salvage(response)
-            else:
-                log_process("No partial salvage allowed. Returning default struct.", "WARNING", module="ResumeExtractor")
-                return default_struct
+            # Strict parse first; surrounding prose, near-JSON (json5) and salvage are handled there.
+            parsed, partial = loads_or_salvage(response, expect=dict)
+        except ValueError as e:
+            log_process(f"JSON parsing failed: {e}. Returning default struct.", "WARNING", module="ResumeExtractor")
+            return default_struct
+        if partial:
+            log_process("JSON parsing failed; using partially salvaged fields", "DEBUG", module="ResumeExtractor")
+        if not isinstance(parsed, dict):
+            return default_struct
     else:
         # If it's already a dict, assume we can use it as-is
         parsed = response
@@ -181,82 +243,212 @@ def _clean_api_response(response: Any) -> Dict[str, Any]:
             result[key] = parsed[key]
     return result
 
+@lru_cache(maxsize=1)
+def load_prompts() -> Dict[str, Any]:
+    """
+    Loads and caches the prompt library from STATIC_DATA/prompt_templates/all_prompts.json.
+    The file is static for the lifetime of a run, so it is read and parsed only once.
+    """
+    prompts_path = Path("STATIC_DATA/prompt_templates/all_prompts.json")
+    if not prompts_path.exists():
+        raise ResumeExtractionError(f"Prompt file not found at {prompts_path}")
+    with open(prompts_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+@lru_cache(maxsize=1)
+def _resume_prompt_parts() -> Tuple[str, str, str]:
+    """
+    Returns (prefix, suffix, system_message) for 'resume_extraction_strict_prompt'.
+
+    The template is split once around its {resume_text} slot, so each extraction is a plain
+    concatenation. str.format cannot be used here: the template embeds a literal JSON example.
+    """
+    resume_prompt_data = load_prompts()["resume_extraction_strict_prompt"]
+    prefix, _, suffix = resume_prompt_data["prompt"].partition("{resume_text}")
+    return prefix, suffix, resume_prompt_data["system_message"]
+
+def _extraction_prompt(raw_text: str, file_name: str) -> Tuple[str, str]:
+    """
+    Returns (prompt, system_message) for one resume extraction.
+    Raises ResumeExtractionError if the text is too short or has too few year mentions to be a resume.
+    """
+    if len(raw_text) < _MIN_RESUME_CHARS or len(_YEAR_RE.findall(raw_text)) < _MIN_YEAR_MENTIONS:
+        raise ResumeExtractionError(f"Insufficient resume content in {file_name}")
+    # Insert the resume text into the pre-split "resume_extraction_strict_prompt"
+    prefix, suffix, system_message = _resume_prompt_parts()
+    return prefix + raw_text + suffix, system_message
+
+def _cached_extraction(extraction_prompt: str, system_message: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Returns (key, parsed_data) for a previously validated extraction of this prompt
+    (which embeds the resume text), or (key, None) on a miss or when the cache is disabled.
+    Extractions run at temperature 0 (_EXTRACTION_TEMPERATURE), so a cached one is what a new call would return.
+    """
+    key = make_result_key("resume_extraction", f"t={_EXTRACTION_TEMPERATURE}", system_message, extraction_prompt)
+    return key, get_cached_result(key)
+
+def _store_extraction(key: str, parsed_data: Dict[str, Any]) -> None:
+    """
+    Caches parsed_data under key, but only if the extraction produced any resume content.
+    """
+    if parsed_data.get("objective") or parsed_data.get("skills_list") or parsed_data.get("jobs_section"):
+        set_cached_result(key, parsed_data)
+
+def _resume_data_from_parsed(parsed_data: Dict[str, Any], raw_text: str, file_name: str) -> ResumeData:
+    """
+    Builds the ResumeData record, with its metadata, from the cleaned LLM output.
+    """
+    # Build the final dictionary with metadata. The rid comes from sequential_id, so resumes
+    # extracted concurrently in the same second still get distinct RES-<rid>.json records.
+    now = datetime.datetime.now()
+    final_dict = {
+        "rid": sequential_id(),
+        "objective": parsed_data.get("objective", ""),
+        "skills_list": parsed_data.get("skills_list", []),
+        "jobs_section": parsed_data.get("jobs_section", []),
+        "education": parsed_data.get("education", []),
+        "certifications": parsed_data.get("certifications", []),
+        "raw_text": raw_text,
+        "source_file": file_name,
+        "extraction_date": now.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    return ResumeData.from_dict(final_dict)
+
 def extract_resume_data(raw_text: str, file_name: str) -> ResumeData:
     """
     Extracts structured resume data by calling the LLM with the strict resume prompt.
 
     Steps:
-    - Load 'resume_extraction_strict_prompt' from all_prompts.json
-    - Format the prompt with {resume_text}
-    - Call the API via call_api
+    - Take the cached, pre-split 'resume_extraction_strict_prompt' from all_prompts.json
+    - Insert the resume text into its {resume_text} slot
+    - Call the API via call_api, unless a validated extraction of the same prompt is cached
     - Parse the response JSON and build a ResumeData object
+
+    Raises ResumeExtractionError without calling the LLM if the text is too short
+    or has too few year mentions to be a resume.
     """
+    extraction_prompt, system_message = _extraction_prompt(raw_text, file_name)
     try:
-        # The all_prompts are presumably in STATIC_DATA/prompt_templates/all_prompts.json
-        prompts_path = Path("STATIC_DATA/prompt_templates/all_prompts.json")
-        if not prompts_path.exists():
-            raise ResumeExtractionError(f"Prompt file not found at {prompts_path}")
-
-        with open(prompts_path, "r", encoding="utf-8") as f:
-            prompts = json.load(f)
-
-        # We use the "resume_extraction_strict_prompt"
-        resume_prompt_data = prompts["resume_extraction_strict_prompt"]
-        prompt_template = resume_prompt_data["prompt"]
-        system_message = resume_prompt_data["system_message"]
-
-        # Insert the resume text into the prompt
-        extraction_prompt = prompt_template.format(resume_text=raw_text)
-
-        # Call the LLM
-        log_process("Calling LLM to extract structured resume data...", "DEBUG", module="ResumeExtractor")
-        result = call_api(prompt=extraction_prompt, system_message=system_message)
-
-        # Clean/parse the result
-        parsed_data = _clean_api_response(result)
-        # Build the final dictionary with metadata
-        final_dict = {
-            "rid": datetime.datetime.now().strftime("%Y%m%d_%H%M%S"),
-            "objective": parsed_data.get("objective", ""),
-            "skills_list": parsed_data.get("skills_list", []),
-            "jobs_section": parsed_data.get("jobs_section", []),
-            "education": parsed_data.get("education", []),
-            "certifications": parsed_data.get("certifications", []),
-            "raw_text": raw_text,
-            "source_file": file_name,
-            "extraction_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-
-        return ResumeData.from_dict(final_dict)
+        key, parsed_data = _cached_extraction(extraction_prompt, system_message)
+        if parsed_data is None:
+            log_process("Calling LLM to extract structured resume data...", "DEBUG", module="ResumeExtractor")
+            result = call_api(prompt=extraction_prompt, system_message=system_message, json_mode=True, temperature=_EXTRACTION_TEMPERATURE)
+            parsed_data = _clean_api_response(result)
+            _store_extraction(key, parsed_data)
+        return _resume_data_from_parsed(parsed_data, raw_text, file_name)
+    except Exception as e:
+        raise ResumeExtractionError(f"Failed to extract resume data: {e}")
 
+async def extract_resume_data_async(raw_text: str, file_name: str) -> ResumeData:
+    """
+    Asynchronous counterpart of extract_resume_data: awaits acall_api, so many extractions
+    can share one event loop with their LLM requests in flight at the same time.
+    """
+    extraction_prompt, system_message = _extraction_prompt(raw_text, file_name)
+    try:
+        key, parsed_data = _cached_extraction(extraction_prompt, system_message)
+        if parsed_data is None:
+            log_process("Calling LLM to extract structured resume data...", "DEBUG", module="ResumeExtractor")
+            result = await acall_api(prompt=extraction_prompt, system_message=system_message, json_mode=True, temperature=_EXTRACTION_TEMPERATURE)
+            parsed_data = _clean_api_response(result)
+            _store_extraction(key, parsed_data)
+        return _resume_data_from_parsed(parsed_data, raw_text, file_name)
     except Exception as e:
         raise ResumeExtractionError(f"Failed to extract resume data: {e}")
 
+def _resume_data_dir() -> Path:
+    """
+    Returns the directory holding the extracted RES-*.json records.
+    """
+    return Path(CONFIG.get("EXTRACTED_DATA_DIR", "EXTRACTED_DATA")) / "resume_data"
+
+def _write_processed_index(processed: Set[str]) -> None:
+    """
+    Atomically rewrites the processed index file (temp file + os.replace).
+    """
+    index_path = _resume_data_dir() / PROCESSED_INDEX_NAME
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(sorted(processed), indent=2), encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+def _load_processed_index() -> Set[str]:
+    """
+    Returns the set of source filenames that already have an extraction record.
+
+    The set is read from the index file on first use and kept in memory. If the
+    index file is missing or unreadable, it is rebuilt once from the RES-*.json records.
+    """
+    global _PROCESSED_CACHE
+    with _INDEX_LOCK:
+        if _PROCESSED_CACHE is None:
+            _PROCESSED_CACHE = _build_processed_index()
+        return _PROCESSED_CACHE
+
+def _build_processed_index() -> Set[str]:
+    """
+    Reads the processed index file, rebuilding it from the RES-*.json records if needed.
+    """
+    data_dir = _resume_data_dir()
+    index_path = data_dir / PROCESSED_INDEX_NAME
+    processed: Optional[Set[str]] = None
+    if index_path.exists():
+        try:
+            processed = set(json.loads(index_path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError) as e:
+            log_process(f"Processed index unreadable, rebuilding: {e}", "WARNING", module="ResumeExtractor")
+
+    if processed is None:
+        processed = set()
+        if data_dir.exists():
+            # os.scandir yields DirEntry names without wrapping each entry in a Path.
+            with os.scandir(data_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("RES-") and entry.name.endswith(".json")):
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            raw = f.read()
+                        source_file = (orjson.loads(raw) if orjson is not None else json.loads(raw)).get("source_file")
+                        if source_file:
+                            processed.add(source_file)
+                    except Exception as e:
+                        log_process(f"Skipping unreadable record {entry.name}: {e}", "WARNING", module="ResumeExtractor")
+            _write_processed_index(processed)
+    return processed
+
+def is_resume_file_processed(resume_file: Union[str, Path]) -> bool:
+    """
+    Returns True if an extraction record already exists for this source file.
+    """
+    return Path(resume_file).name in _load_processed_index()
+
 def save_resume_data(resume_data: ResumeData) -> Path:
     """
     Saves the extracted ResumeData as a JSON file in EXTRACTED_DATA/resume_data/.
+    An existing record is never overwritten: if RES-<rid>.json is taken (e.g. by an earlier run),
+    the record gets a fresh rid from sequential_id.
     Returns the path to the saved JSON.
     """
-    output_dir = Path(CONFIG.get("EXTRACTED_DATA_DIR", "EXTRACTED_DATA")) / "resume_data"
+    output_dir = _resume_data_dir()
     output_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"RES-{resume_data.rid}.json"
-    output_path = output_dir / filename
-
-    # Merge the fields from ResumeData into a single dict
-    data_dict = {
-        "rid": resume_data.rid,
-        "objective": resume_data.objective,
-        "skills_list": resume_data.skills_list,
-        "jobs_section": resume_data.jobs_section,
-        "education": resume_data.education,
-        "certifications": resume_data.certifications,
-        "raw_text": resume_data.raw_text,
-        "source_file": resume_data.source_file,
-        "extraction_date": resume_data.extraction_date
-    }
 
     try:
-        safe_file_write(output_path, data_dict)
+        with _INDEX_LOCK:
+            output_path = output_dir / f"RES-{resume_data.rid}.json"
+            while output_path.exists():
+                resume_data.rid = sequential_id()
+                output_path = output_dir / f"RES-{resume_data.rid}.json"
+            # Serialize straight to UTF-8 bytes and write in binary mode. orjson serializes the
+            # dataclass natively; the stdlib fallback uses its instance dict (fields in declaration order).
+            if orjson is not None:
+                payload = orjson.dumps(resume_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(vars(resume_data), indent=2).encode("utf-8")
+            safe_file_write(output_path, payload)
+            processed = _load_processed_index()
+            processed.add(resume_data.source_file)
+            _write_processed_index(processed)
         log_process(f"Saved extracted resume data to {output_path}", "INFO", module="ResumeExtractor")
         return output_path
     except Exception as e:
@@ -272,9 +464,14 @@ def process_resume_file(resume_file: Union[str, Path]) -> Optional[ResumeData]:
     """
     resume_file = Path(resume_file)
     log_process(f"Processing resume file: {resume_file.name}", "INFO", module="ResumeExtractor")
+    return _process_resume_text(resume_file, extract_text_from_file(resume_file))
 
+def _process_resume_text(resume_file: Path, raw_text: Optional[str]) -> Optional[ResumeData]:
+    """
+    Runs the LLM extraction on already-read resume text and saves the result.
+    Returns the ResumeData, or None if an error occurs.
+    """
     try:
-        raw_text = extract_text_from_file(resume_file)
         if not raw_text or not raw_text.strip():
             raise ResumeExtractionError(f"No text extracted from {resume_file.name}")
 
@@ -289,20 +486,102 @@ def process_resume_file(resume_file: Union[str, Path]) -> Optional[ResumeData]:
         log_process(f"Failed to process resume file {resume_file.name}: {e}", "ERROR", module="ResumeExtractor")
         return None
 
+def process_resume_directory(directory: Union[str, Path]) -> List[ResumeData]:
+    """
+    Processes every unprocessed resume file in a directory (non-recursive).
+
+    Text extraction runs on a thread pool sized to the CPU count (PyMuPDF and lxml release the
+    GIL while parsing; long PDFs use pdf_text's shared process pool). The LLM extraction step
+    (I/O-bound) then runs on threads, at most CONCURRENT_FILE_LIMIT at once so the provider is
+    not flooded. Returns the ResumeData objects in file-name order.
+    """
+    with os.scandir(directory) as entries:
+        candidates = sorted(
+            Path(entry.path) for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(RESUME_SUFFIXES)
+        )
+    pending = [f for f in candidates if not is_resume_file_processed(f)]
+    if len(pending) < len(candidates):
+        log_process(f"Skipping {len(candidates) - len(pending)} already processed resumes", "INFO", module="ResumeExtractor")
+    if not pending:
+        return []
+
+    log_process(f"Processing {len(pending)} resume files from {directory}", "INFO", module="ResumeExtractor")
+    with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 1, len(pending))) as executor:
+        texts = list(executor.map(extract_text_from_file, pending))
+
+    workers = max(1, min(CONFIG["CONCURRENT_FILE_LIMIT"], len(pending)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [result for result in executor.map(_process_resume_text, pending, texts) if result]
+
 def process_resume_files(resume_file: Union[str, Path]) -> List[ResumeData]:
     """
-    Processes a single resume file (or potentially could be expanded to handle a directory).
-    Returns a list of ResumeData objects (usually one per file).
+    Processes a single resume file, or every resume file in a directory (see process_resume_directory).
+    Returns a list of ResumeData objects (one per successfully processed file).
     """
     resume_file = Path(resume_file)
     if not resume_file.exists():
         log_process(f"Resume file not found: {resume_file}", "ERROR", module="ResumeExtractor")
         return []
 
-    # If you wanted to handle directories, you could do so here. For now, we assume single file usage.
+    if resume_file.is_dir():
+        return process_resume_directory(resume_file)
     if resume_file.is_file():
+        if is_resume_file_processed(resume_file):
+            log_process(f"Skipping already processed resume: {resume_file.name}", "INFO", module="ResumeExtractor")
+            return []
         result = process_resume_file(resume_file)
         return [result] if result else []
     else:
-        log_process(f"{resume_file} is not a file.", "ERROR", module="ResumeExtractor")
+        log_process(f"{resume_file} is not a file or directory.", "ERROR", module="ResumeExtractor")
         return []
+
+async def process_resume_file_async(resume_file: Union[str, Path]) -> Optional[ResumeData]:
+    """
+    Asynchronous counterpart of process_resume_file. Text extraction and the record write run
+    on worker threads; the LLM call is awaited (extract_resume_data_async).
+    Already processed files are skipped. Returns the ResumeData, or None if skipped or on error.
+    """
+    resume_file = Path(resume_file)
+    if is_resume_file_processed(resume_file):
+        log_process(f"Skipping already processed resume: {resume_file.name}", "INFO", module="ResumeExtractor")
+        return None
+    log_process(f"Processing resume file: {resume_file.name}", "INFO", module="ResumeExtractor")
+    try:
+        raw_text = await asyncio.to_thread(extract_text_from_file, resume_file)
+        if not raw_text or not raw_text.strip():
+            raise ResumeExtractionError(f"No text extracted from {resume_file.name}")
+        resume_data = await extract_resume_data_async(raw_text, resume_file.name)
+        await asyncio.to_thread(save_resume_data, resume_data)
+        return resume_data
+    except Exception as e:
+        log_process(f"Failed to process resume file {resume_file.name}: {e}", "ERROR", module="ResumeExtractor")
+        return None
+
+async def process_resume_files_async(resume_files: List[Union[str, Path]], concurrency: Optional[int] = None) -> List[ResumeData]:
+    """
+    Asynchronous counterpart of process_resume_files for many files, for callers that already run an event loop.
+    Files go through process_resume_file_async (directories through process_resume_files on a
+    worker thread); an asyncio.Semaphore caps the number of extractions (and therefore LLM
+    requests) in flight at CONCURRENT_FILE_LIMIT by default.
+    Records are written by save_resume_data, so concurrent extractions get distinct rids and never
+    overwrite each other; a path given more than once is processed once.
+    Returns the ResumeData objects of every successfully processed file, in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or CONFIG["CONCURRENT_FILE_LIMIT"]))
+    # Duplicate paths would pass the processed-index check together and be extracted twice.
+    unique_files: Dict[Path, Union[str, Path]] = {}
+    for resume_file in resume_files:
+        unique_files.setdefault(Path(resume_file).resolve(), resume_file)
+
+    async def _process_one(resume_file: Union[str, Path]) -> List[ResumeData]:
+        async with semaphore:
+            if Path(resume_file).is_dir():
+                return await asyncio.to_thread(process_resume_files, resume_file)
+            result = await process_resume_file_async(resume_file)
+            return [result] if result else []
+
+    results: List[ResumeData] = []
+    for file_results in await asyncio.gather(*(_process_one(f) for f in unique_files.values())):
+        results.extend(file_results)
+    return results
@@ -0,0 +1,143 @@
+# resume_similarity.py
+# v1.0.0
+# 2-27-25
+
+'''
+Plan:
+
+    Represent resumes and job descriptions as hashed bag-of-words vectors (no model download).
+    Cache each resume's vector by a hash of its text, so it is computed once per run.
+    Rank resumes for a job by cosine similarity and keep the top N above a threshold.
+'''
+
+"""
+Resume Similarity Module
+
+This module selects the resumes most relevant to a job description:
+- Text is tokenized, hashed into a fixed number of buckets (stable CRC32 hashing),
+  weighted by sublinear term frequency, and L2-normalized into a sparse vector.
+- Resume vectors are quantized to int8 weights (uint16 indices, one scale) and cached
+  by the SHA-256 of the resume's text; job vectors stay float.
+- rank_resumes returns the top N resumes by cosine similarity to the job,
+  dropping those below RESUME_MIN_SIMILARITY. Callers ranking the same resumes for many
+  jobs pass their resume_vectors once, so only the job vector is computed per job.
+"""
+
+import re
+import math
+import zlib
+import heapq
+import hashlib
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_manager import CONFIG
+
+# Type alias for a sparse vector: bucket index -> weight.
+SparseVector = Dict[int, float]
+# Cached resume vector: (bucket indices as uint16, weights as int8, dequantization scale).
+QuantizedVector = Tuple[array, array, float]
+
+# Number of hash buckets per vector (fits the uint16 index arrays).
+VECTOR_DIM = 1 << 16
+
+# Lowercased word tokens; keeps "c++", "c#", ".net"-style suffixes together.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Quantized resume vectors keyed by the SHA-256 of their text.
+_VECTOR_CACHE: Dict[str, QuantizedVector] = {}
+_VECTOR_CACHE_LOCK = threading.Lock()
+
+def text_vector(text: str) -> SparseVector:
+    """
+    Returns the L2-normalized hashed term-frequency vector of text.
+    """
+    counts = Counter(zlib.crc32(token.encode("utf-8")) % VECTOR_DIM for token in _TOKEN_RE.findall(text.lower()))
+    vector = {index: 1.0 + math.log(count) for index, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {index: weight / norm for index, weight in vector.items()}
+
+def cosine_similarity(a: SparseVector, b: SparseVector) -> float:
+    """
+    Returns the cosine similarity of two normalized sparse vectors.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+def quantize_vector(vector: SparseVector) -> QuantizedVector:
+    """
+    Packs a sparse vector into uint16 indices and int8 weights with a single scale
+    (about 3 bytes per entry instead of a dict entry with a boxed float).
+    """
+    if not vector:
+        return array("H"), array("b"), 0.0
+    scale = max(abs(weight) for weight in vector.values()) / 127.0
+    return (
+        array("H", vector.keys()),
+        array("b", (round(weight / scale) for weight in vector.values())),
+        scale
+    )
+
+def quantized_similarity(query: SparseVector, vector: QuantizedVector) -> float:
+    """
+    Returns the cosine similarity of a float query vector and a quantized vector.
+    """
+    indices, weights, scale = vector
+    get = query.get
+    return scale * sum(get(index, 0.0) * weight for index, weight in zip(indices, weights))
+
+def resume_text(resume: Dict[str, Any]) -> str:
+    """
+    Flattens the parts of a resume that matter for matching into one string.
+    """
+    parts = [resume.get("objective", "")]
+    parts.extend(resume.get("skills_list", ()))
+    for job in resume.get("jobs_section", ()):
+        for bullet in job.get("bullets", ()):
+            parts.append(bullet.get("bolded_overview", ""))
+            parts.append(bullet.get("description", ""))
+    return "\n".join(part for part in parts if isinstance(part, str))
+
+def resume_vector(resume: Dict[str, Any]) -> QuantizedVector:
+    """
+    Returns the resume's quantized vector, computing it only the first time its text is seen.
+    """
+    text = resume_text(resume)
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _VECTOR_CACHE_LOCK:
+        vector = _VECTOR_CACHE.get(key)
+    if vector is None:
+        vector = quantize_vector(text_vector(text))
+        with _VECTOR_CACHE_LOCK:
+            _VECTOR_CACHE[key] = vector
+    return vector
+
+def resume_vectors(resumes: List[Dict[str, Any]]) -> List[QuantizedVector]:
+    """
+    Returns the quantized vector of each resume, in order (for reuse across rank_resumes calls).
+    """
+    return [resume_vector(resume) for resume in resumes]
+
+def rank_resumes(resumes: List[Dict[str, Any]], job_description: str, top_n: int, vectors: Optional[List[QuantizedVector]] = None) -> List[Dict[str, Any]]:
+    """
+    Returns up to top_n resumes ordered by similarity to job_description,
+    excluding those below RESUME_MIN_SIMILARITY.
+    vectors, if given, are the precomputed resume_vectors(resumes).
+    """
+    if vectors is None:
+        vectors = resume_vectors(resumes)
+    job_vector = text_vector(job_description)
+    threshold = CONFIG["RESUME_MIN_SIMILARITY"]
+    scored = []
+    for position, (resume, vector) in enumerate(zip(resumes, vectors)):
+        score = quantized_similarity(job_vector, vector)
+        if score >= threshold:
+            scored.append((score, -position, resume))
+    return [resume for _, _, resume in heapq.nlargest(top_n, scored, key=lambda item: (item[0], item[1]))]
+
+# End of resume_similarity.py